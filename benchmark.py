@@ -0,0 +1,318 @@
+# name: benchmark
+# description: Python Script that times the engines over a fixed set of graphs and color sets, to compare runs
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# every case plays the same games of a graph with n colors with one engine, in four timed phases:
+#   setup: build what the engine needs for the graph (e.g., the table of packed.py)
+#   generation: make the configurations of the games
+#   search: play the games
+#   output: write the results, as configuration.py does
+# the games are spread evenly over all the games of the graph
+# the positions expanded and seen by the games are counted with the statistics of the engines that have them (dict and packed, see game.search),
+# in a second pass that is not timed, so the counts do not slow down the search
+#
+# with --sweep, every case is a sweep of the first games of the graph instead, as configuration.py plays it:
+#   setup: build the engine, start the worker processes, and find the automorphisms (with --symmetry)
+#   search: make, play, and write the games of every section to the results file (see sweep.py)
+#   output: turn the results file into the xlsx file
+# the results are written to a JSON file, which a later run can compare against, e.g.,
+# $ python3 benchmark.py -o before.json
+# $ python3 benchmark.py -o after.json --compare before.json
+
+import game
+import packed
+import retrograde
+import vectorized
+import factory
+import frozengraph
+import output
+import sweep
+import symmetry
+import argparse
+import functools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# the graphs of the benchmark: a name, and the function (of factory.py) with its arguments
+graphs = [
+    ('path(10)', factory.makePathGraph, (10,)),
+    ('circle(9)', factory.makeCircleGraph, (9,)),
+    ('complete(5)', factory.makeCompleteGraph, (5,)),
+    ('star(7)', factory.makeStarGraph, (7,)),
+    ('windmill(2)', factory.makeWindmillGraph, (2,)),
+    ('doublestar(3-3)', factory.makeDoubleStarGraph, (3, 3)),
+    ('caterpillar(1-2-1)', factory.makeCaterpillarGraph, ([1, 2, 1],)),
+    ('lollipop(4-3)', factory.makeLollipopGraph, (4, 3)),
+    ('house-x', factory.makeHouseXGraph, ()),
+    ('grid(3-3)', factory.makeGridGraph, (3, 3)),
+    ('tent(2-3)', factory.makeMongolianTentGraph, (2, 3)),
+    ('petersen(5-2)', factory.makeGeneralizedPetersenGraph, (5, 2)),
+    ('barbell(3)', factory.makeBarbellGraph, (3,)),
+    ('gear(4)', factory.makeGearGraph, (4,)),
+    ('firecracker(2-3)', factory.makeFirecrackerGraph, (2, 3)),
+    ('web(3)', factory.makeWebGraph, (3,)),
+    ('tree(1-2)', factory.makeTreeGraph, ({1: 2, 2: 2},)),
+]
+
+# the color sets of the benchmark
+colorsets = [3, 4]
+
+# the following function sets up an engine for a "Graph" with n colors
+# it returns the function that plays a game, as configuration.py does
+def setupEngine(engine, Graph, n):
+    if engine == 'dict':
+        return game.is_winnable
+    if engine.startswith('packed'):
+        strategy = engine.partition('-')[2] or 'default'
+        return functools.partial(packed.is_winnable, table=packed.build_table(Graph, n), strategy=strategy)
+    if engine == 'table':
+        return functools.partial(retrograde.is_winnable, solved=retrograde.solve_graph(Graph, n))
+    if engine == 'vectorized':
+        return functools.partial(vectorized.is_winnable, table=vectorized.build_table(Graph, n))
+
+# the engines of the benchmark, the packed engine is run with every strategy
+engines = ['dict', 'packed', 'packed-bfs', 'packed-dfs', 'packed-bidirectional', 'packed-incremental', 'table', 'vectorized']
+
+# the following function counts the positions expanded and seen by the given games, with the statistics of the engine
+# it returns None for both if the engine has no statistics
+def countStates(play, engine, Graph, configurations):
+    if engine not in ['dict'] and not engine.startswith('packed'):
+        return None, None
+
+    expanded = 0
+    seen = 0
+    for configuration in configurations:
+        stats = {}
+        play(Graph, configuration, stats=stats)
+        expanded += stats['expanded']
+        seen += stats['seen']
+
+    return expanded, seen
+
+# the following function runs a single case: the given number of "games" of a graph with n colors, with an engine
+# it returns the measurements of the case as a dictionary
+def runCase(name, Graph, n, engine, games, measureMemory):
+    game.n = n
+    size = len(Graph)
+    totalGames = ((n-1) ** (size-1)) * size
+    games = min(games, totalGames)
+    phases = {}
+
+    if measureMemory:
+        tracemalloc.start()
+
+    t0 = time.perf_counter()
+    play = setupEngine(engine, Graph, n)
+    phases['setup'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    configurations = [factory.gameToConfiguration(1 + i*totalGames//games, size, n) for i in range(games)]
+    phases['generation'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    results = []
+    for configuration in configurations:
+        result, sequence, seen = play(Graph, configuration)
+        results.append((configuration, result, sequence))
+    phases['search'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    file, path = tempfile.mkstemp(suffix='.jsonl')
+    os.close(file)
+    resultWriter = output.ResultWriter(path, {'type': name, 'size': size, 'n': n, 'range': [1, games]})
+    for gameIndex, (configuration, result, sequence) in enumerate(results, 1):
+        resultWriter.writeGame(gameIndex, configuration, result, sequence)
+    resultWriter.close()
+    os.remove(path)
+    phases['output'] = time.perf_counter() - t0
+
+    peakMemory = None
+    if measureMemory:
+        peakMemory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    expanded, seen = countStates(play, engine, Graph, configurations)
+    return describeCase(name, n, engine, 'games', games, sum(1 for configuration, result, sequence in results if result), expanded, seen, peakMemory, phases)
+
+# the following function runs a single case as a sweep of the first "games" of a graph with n colors, with an engine
+# the games are played by the given number of "workers" (as with the --workers argument of configuration.py), and only a game for every set of
+# symmetric configurations is played if "symmetric" is True (as with --symmetry)
+# it returns the measurements of the case as a dictionary, the peak memory is not measured, as most of it is in the worker processes
+# the number of automorphisms of the graph is added to the measurements of a symmetric sweep
+def runSweep(name, Graph, n, engine, games, workers, symmetric):
+    game.n = n
+    size = len(Graph)
+    totalGames = ((n-1) ** (size-1)) * size
+    gamesPerSection = totalGames // size
+    games = min(games, totalGames)
+    phases = {}
+
+    t0 = time.perf_counter()
+    play = setupEngine(engine, Graph, n)
+    pool = sweep.makePool(workers, Graph, n, play) if workers > 1 else None
+    if symmetric:
+        generators, automorphismCount = symmetry.find_generators(Graph)
+        solved = {}
+    phases['setup'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    file, path = tempfile.mkstemp(suffix='.jsonl')
+    os.close(file)
+    resultWriter = output.ResultWriter(path, {'type': name, 'size': size, 'n': n, 'range': [1, games]})
+    won = 0
+    for zeroPosition in range(1, (games-1) // gamesPerSection + 2):
+        first = (zeroPosition-1)*gamesPerSection + 1
+        last = min(games, zeroPosition*gamesPerSection)
+        configurations = factory.generateConfigurations(size, n, first, last)
+        chunkSize = max(1, min(64, (last - first + 1) // (workers * 4)))
+        if symmetric:
+            results = sweep.playSymmetricConfigurations(configurations, Graph, n, play, generators, solved, pool, chunkSize, (1, games))
+        else:
+            results = sweep.playConfigurations(configurations, Graph, play, pool, chunkSize)
+        for gameIndex, (configuration, result, sequence, stats) in enumerate(results, first):
+            resultWriter.writeGame(gameIndex, configuration, result, sequence, stats)
+            if result:
+                won += 1
+    if pool is not None:
+        pool.close()
+        pool.join()
+    phases['search'] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    summary = output.SummarySheet()
+    summary.write(0, 0, "Played")
+    summary.write(1, 0, games)
+    summary.write(0, 1, "Won")
+    summary.write(1, 1, won)
+    resultWriter.writeSummary(summary)
+    resultWriter.close()
+    file, xlsxPath = tempfile.mkstemp(suffix='.xlsx')
+    os.close(file)
+    output.exportToXlsx(path, xlsxPath)
+    os.remove(path)
+    os.remove(xlsxPath)
+    phases['output'] = time.perf_counter() - t0
+
+    r = describeCase(name, n, engine, 'sweep', games, won, None, None, None, phases)
+    if symmetric:
+        r['automorphisms'] = automorphismCount
+    return r
+
+# the following function makes the measurements of a case, with the positions expanded and seen per second of search (if counted)
+def describeCase(name, n, engine, mode, games, won, expanded, seen, peakMemory, phases):
+    search = phases['search']
+    return {
+        'graph': name,
+        'n': n,
+        'engine': engine,
+        'mode': mode,
+        'games': games,
+        'won': won,
+        'gamesPerSecond': games / search if search > 0 else None,
+        'expanded': expanded,
+        'seen': seen,
+        'expandedPerSecond': expanded / search if expanded is not None and search > 0 else None,
+        'seenPerSecond': seen / search if seen is not None and search > 0 else None,
+        'peakMemory': peakMemory,
+        'time': phases,
+    }
+
+# the following function compares the "results" of this run with the results of an earlier run in the file at "path"
+# it prints the change of the search time of every case found in both runs, and returns the cases slower by more than the "tolerance"
+# cases faster than "minimumTime" in both runs are too short to time reliably, and are never counted as slower
+def compareResults(results, measureMemory, path, tolerance, minimumTime):
+    with open(path) as file:
+        benchmark = json.load(file)
+    earlier = {(r['graph'], r['n'], r['engine'], r.get('mode', 'games')): r for r in benchmark['results']}
+
+    slower = []
+    print("Comparison with: {}".format(path))
+    if benchmark['memory'] != measureMemory:
+        print("Note: only one of the runs measured the peak memory, which slows down every phase")
+    for r in results:
+        key = (r['graph'], r['n'], r['engine'], r['mode'])
+        if key not in earlier:
+            continue
+        before = earlier[key]['time']['search']
+        after = r['time']['search']
+        change = (after - before) / before if before > 0 else 0
+        flag = ""
+        if change > tolerance and max(before, after) >= minimumTime:
+            flag = " (slower)"
+            slower.append(key)
+        if earlier[key]['won'] != r['won']:
+            flag += " (different results)"
+            slower.append(key)
+        print("{} z({}) {} ({}): {:.3f}s -> {:.3f}s ({:+.1%}){}".format(key[0], key[1], key[2], key[3], before, after, change, flag))
+
+    return slower
+
+# setup the argument parser
+parser = argparse.ArgumentParser()
+parser.add_argument('-o', '--output', type=str, help="the JSON file to write the results to (default: benchmark.json)", metavar='file', default='benchmark.json')
+parser.add_argument('--games', type=int, help="the number of games played in every case (default: 10)", metavar='k', default=10)
+parser.add_argument('--engines', type=str, nargs='+', help="the engines to run: {} (default: all)".format(", ".join(engines)), metavar='engine', choices=engines, default=engines)
+parser.add_argument('--graphs', type=str, nargs='+', help="the graphs to run, by name (default: all)", metavar='graph')
+parser.add_argument('--sweep', action="store_true", help="run every case as a sweep of the first k games, as configuration.py plays them (sections, worker processes, results file, and xlsx file)")
+parser.add_argument('--workers', type=int, help="the number of processes playing the games of a sweep (default: 1)", metavar='N', default=1)
+parser.add_argument('--symmetry', action="store_true", help="play a single game for every set of symmetric configurations of a sweep")
+parser.add_argument('--no-memory', action="store_true", help="do not measure the peak memory (tracing the memory slows down every phase)")
+parser.add_argument('--compare', type=str, help="an earlier results file to compare the search times against", metavar='file')
+parser.add_argument('--tolerance', type=float, help="the fraction by which a case may be slower than in the compared file (default: 0.1)", metavar='f', default=0.1)
+parser.add_argument('--min-time', type=float, help="the search time (in seconds) under which a case is too short to compare (default: 0.05)", metavar='s', default=0.05)
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    names = [name for name, make, arguments in graphs]
+    if args.graphs is not None:
+        for name in args.graphs:
+            if name not in names:
+                print("benchmark.py: error: argument --graphs: invalid choice: '{}' (choose from {})".format(name, ", ".join(names)))
+                sys.exit()
+    if args.workers < 1:
+        print("benchmark.py: error: argument --workers: must be at least 1")
+        sys.exit()
+    if (args.workers > 1 or args.symmetry) and not args.sweep:
+        print("benchmark.py: error: argument --workers/--symmetry: requires a sweep: use '--sweep'")
+        sys.exit()
+    if 'vectorized' in args.engines and vectorized.numpy is None:
+        print("benchmark.py: error: argument --engines: the vectorized engine requires NumPy: use 'pip install numpy'")
+        sys.exit()
+
+    # the peak memory is only measured for cases that are not sweeps (see runSweep)
+    measureMemory = not args.no_memory and not args.sweep
+    results = []
+    for name, make, arguments in graphs:
+        if args.graphs is not None and name not in args.graphs:
+            continue
+        Graph = frozengraph.freeze(make(*arguments))
+        for n in colorsets:
+            for engine in args.engines:
+                if args.sweep:
+                    r = runSweep(name, Graph, n, engine, args.games, args.workers, args.symmetry)
+                else:
+                    r = runCase(name, Graph, n, engine, args.games, measureMemory)
+                results.append(r)
+                line = "{} z({}) {} ({}): {} games, {:.3f}s search, {:.1f} games/s".format(name, n, engine, r['mode'], r['games'], r['time']['search'], r['gamesPerSecond'] or 0)
+                if r['expanded'] is not None:
+                    line += ", {} expanded ({:.0f}/s), {} seen ({:.0f}/s)".format(r['expanded'], r['expandedPerSecond'] or 0, r['seen'], r['seenPerSecond'] or 0)
+                if 'automorphisms' in r:
+                    line += ", {} automorphisms".format(r['automorphisms'])
+                print(line, flush=True)
+
+    with open(args.output, 'w') as file:
+        json.dump({'created': time.strftime("%Y-%m-%d %H:%M:%S"), 'python': platform.python_version(), 'platform': platform.platform(), 'games': args.games, 'sweep': args.sweep, 'workers': args.workers, 'symmetry': args.symmetry, 'memory': measureMemory, 'results': results}, file, indent=1)
+    print("")
+    print("Generating File: {}".format(args.output))
+
+    if args.compare is not None:
+        print("")
+        if len(compareResults(results, measureMemory, args.compare, args.tolerance, args.min_time)) > 0:
+            sys.exit(1)
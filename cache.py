@@ -0,0 +1,120 @@
+# name: cache
+# description: Python Script that keeps the results of positions on disk, to reuse them across games and runs
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# positions are packed as in packed.py, and are kept per graph (by its fingerprint) and color set
+# a winnable position also keeps its winning line: the positions that follow it, up to the win
+# the file is an SQLite database, which several processes can read and write at the same time
+
+import hashlib
+import os
+import sqlite3
+import time
+
+# the following function makes a fingerprint for a given "Graph"
+# graphs with the same vertices and edges have the same fingerprint, no matter the order of the lists
+# a frozen graph (see frozengraph.py) keeps its fingerprint, which is not found again
+def fingerprint(Graph):
+    if hasattr(Graph, 'fingerprint'):
+        return Graph.fingerprint
+    description = ";".join("{}:{}".format(vertex, ",".join(str(v) for v in sorted(Graph[vertex]))) for vertex in sorted(Graph))
+    return hashlib.sha1(description.encode()).hexdigest()
+
+# the following class is the cache of solved positions, kept in the file at the given "path"
+# when the cache holds more than "maxEntries" positions, the positions used longest ago are removed
+class SolvedCache:
+    def __init__(self, path, maxEntries=1000000):
+        self.path = path
+        self.maxEntries = maxEntries
+        self.connection = None
+        self.pid = None
+        self.entries = None
+        self.touched = []
+
+    # the following function returns the connection of this process, and opens it on first use
+    # every process (e.g., a worker of a pool) opens its own connection to the file
+    def connect(self):
+        if self.connection is None or self.pid != os.getpid():
+            self.connection = sqlite3.connect(self.path, timeout=60)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS positions (graph TEXT, n INTEGER, position TEXT, winnable INTEGER, line TEXT, used REAL, PRIMARY KEY (graph, n, position)) WITHOUT ROWID")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS positions_used ON positions (used)")
+            self.connection.commit()
+            self.pid = os.getpid()
+            self.entries = None
+            self.touched = []
+        return self.connection
+
+    # the following function looks up the given "positions" of the graph with the given "graphFingerprint" and n colors
+    # it returns a dictionary that maps every position found to its result and winning line (empty if not winnable)
+    # the positions found are marked as used with the next call to store (or flush), so that a lookup does not write to the file
+    def lookup(self, graphFingerprint, n, positions):
+        connection = self.connect()
+        found = {}
+
+        # look up at most 500 positions at a time, to stay under the SQLite limit of query parameters
+        positions = list(positions)
+        for begin in range(0, len(positions), 500):
+            keys = [format(position, 'x') for position in positions[begin:begin+500]]
+            query = "SELECT position, winnable, line FROM positions WHERE graph = ? AND n = ? AND position IN ({})".format(",".join("?" * len(keys)))
+            for position, winnable, line in connection.execute(query, [graphFingerprint, n] + keys):
+                line = [int(p, 16) for p in line.split(",")] if line else []
+                found[int(position, 16)] = (winnable == 1, line)
+
+        for position in found:
+            self.touched.append((graphFingerprint, n, format(position, 'x')))
+
+        return found
+
+    # the following function stores the result and winning line of every position in the dictionary "solved"
+    # it also marks the positions found by lookup since the last call as used
+    def store(self, graphFingerprint, n, solved):
+        connection = self.connect()
+        now = time.time()
+        rows = []
+        for position in solved:
+            winnable, line = solved[position]
+            rows.append((graphFingerprint, n, format(position, 'x'), 1 if winnable else 0, ",".join(format(p, 'x') for p in line), now))
+
+        with connection:
+            self.markUsed(now)
+            connection.executemany("INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+        # count the positions only now and then, the count is kept up to date in between
+        if self.entries is None:
+            self.entries = connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+        else:
+            self.entries += len(rows)
+
+        if self.entries > self.maxEntries:
+            self.evict()
+
+    # the following function marks the positions found by lookup since the last call to store (or flush) as used, at the time "now"
+    # it is called within a transaction of the connection
+    def markUsed(self, now):
+        self.connection.executemany("UPDATE positions SET used = ? WHERE graph = ? AND n = ? AND position = ?", [(now,) + key for key in self.touched])
+        self.touched = []
+
+    # the following function marks the positions found by lookup since the last call to store (or flush) as used, without storing any position
+    def flush(self):
+        connection = self.connect()
+        with connection:
+            self.markUsed(time.time())
+
+    # the following function removes the positions used longest ago, until the cache is 10% under its size
+    def evict(self):
+        connection = self.connect()
+        with connection:
+            count = connection.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+            excess = count - int(self.maxEntries * 0.9)
+            if excess > 0:
+                connection.execute("DELETE FROM positions WHERE (graph, n, position) IN (SELECT graph, n, position FROM positions ORDER BY used LIMIT ?)", (excess,))
+        self.entries = None
+
+    # the following function closes the connection of this process, if it is open
+    def close(self):
+        if self.connection is not None and self.pid == os.getpid():
+            self.connection.close()
+        self.connection = None
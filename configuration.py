@@ -4,10 +4,23 @@
 # date started: Friday: June 28, 2019
 
 import game
+import packed
+import pruning
+import retrograde
+import vectorized
+import solver
 import factory
-import xlsxwriter
+import frozengraph
+import sweep
+import symmetry
+import output
+import shard
+import progress
 import argparse
+import functools
+import os
 import sys
+import time
 
 # setup the argument parser
 parser = argparse.ArgumentParser()
@@ -25,6 +38,23 @@ parser.add_argument('--step', type=int, help="the kth vertex pattern of the inne
 parser.add_argument('--starShape', type=int, nargs=2, help="the count and size of the stars of the firecracker graph", metavar=('n','k'), default=[2,2])
 parser.add_argument('--roots', type=int, nargs='+', help="the list of root nodes (keys) and subnodes (values) pairs for the tree graph: e.g.,[1, 2]", metavar=('r'), default=[1, 2])
 parser.add_argument('--range', type=int, nargs=2, help="the numbered games to play: [a, b]", metavar=('a','b'))
+parser.add_argument('--shard', type=int, nargs=2, help="play only the kth of N equal parts of the range, to a results file that 'shard.py merge' joins with the other parts (requires '-o jsonl')", metavar=('k','N'))
+parser.add_argument('--engine', type=str, help="the engine used to play the games: dict, packed, table (solves every position of the graph first), vectorized (plays a whole level of positions at once, requires NumPy) (default: dict)", metavar='engine', choices=['dict', 'packed', 'table', 'vectorized'], default='dict')
+parser.add_argument('-o', '--output', type=str, help="the type of file to make: xlsx, jsonl (one line per game, written as games are played) (default: xlsx)", metavar='format', choices=['xlsx', 'jsonl'], default='xlsx')
+parser.add_argument('--checkpoint', type=int, help="the number of seconds between checkpoints of the sweep (default: 60)", metavar='s', default=60)
+parser.add_argument('--resume', action="store_true", help="continue an interrupted sweep with the same arguments from its checkpoint")
+parser.add_argument('--workers', type=int, help="the number of processes playing games at the same time (default: 1)", metavar='N', default=1)
+parser.add_argument('--chunk', type=int, help="the number of games handed to a worker process at a time (default: chosen per section)", metavar='k', default=0)
+parser.add_argument('--symmetry', action="store_true", help="play a single game for every set of configurations that are symmetric under the automorphisms of the graph")
+parser.add_argument('--color-symmetry', action="store_true", help="play a single game for every set of configurations whose peg values are multiples of one another by a unit of Z_n (combined with the automorphisms of the graph with --symmetry)")
+parser.add_argument('--strategy', type=str, help="the order in which the packed engine plays positions: default (as game.py), bfs (shortest winning moves), dfs (fastest result), bidirectional (from the start and back from the wins), incremental (as default, with the moves of every position found from the moves before it) (default: default)", metavar='strategy', choices=['default', 'bfs', 'dfs', 'bidirectional', 'incremental'], default='default')
+parser.add_argument('--cache', type=str, help="the file that keeps the results of positions across games and runs (requires the packed engine)", metavar='file')
+parser.add_argument('--cache-size', type=int, help="the largest number of positions kept in the cache file (default: 1000000)", metavar='N', default=1000000)
+parser.add_argument('--transposition', type=int, help="keep the results of up to N positions in memory across the games of the sweep, which finish faster when they reach a known position (requires the packed engine)", metavar='N', default=0)
+parser.add_argument('--stats', action="store_true", help="write how hard every game was to play (positions expanded, largest frontier, deepest move, ...) next to its number (requires the dict or packed engine)")
+parser.add_argument('--prune', action="store_true", help="never play the positions that the rules of pruning.py prove can never be won (invariant, components, classes): the packed engine checks every position it finds, the other engines the first position of every game")
+parser.add_argument('--progress', type=int, help="print the progress, games per second, states per second (with the dict or packed engine), and time left of the sweep every s seconds", metavar='s', default=0)
+parser.add_argument('--metrics', type=str, help="write the progress of the sweep to a file in the text format of Prometheus, e.g., for the textfile collector of a node exporter (every 10 seconds, or as often as --progress)", metavar='file')
 parser.add_argument('--dry-run', action="store_true", help="simulate playing the game")
 args = parser.parse_args()
 
@@ -126,12 +156,42 @@ if typeDescriptive == 'tree':
     sizeDescription = str(list(args.roots.keys())).replace('[', '').replace(']', '').replace(', ', '-')
     G = factory.makeTreeGraph(args.roots)
 
+# freeze the graph, which checks it for problems and makes every adjacency test take constant time
+try:
+    G = frozengraph.freeze(G)
+except ValueError as error:
+    print("configuration.py: error: the {} graph is not valid: {}".format(typeDescriptive, error))
+    sys.exit()
+
 # set the total number of games
 totalGames = ((n-1) ** (size-1)) * size
 
 # every zero position defines a section with a fixed number of games
 gamesPerSection = int(totalGames / size)
 
+# the cache keeps positions packed as in the packed engine
+if args.cache is not None and args.engine != 'packed':
+    print("configuration.py: error: argument --cache: requires the packed engine: use '--engine packed'")
+    sys.exit()
+if args.transposition > 0 and args.engine != 'packed':
+    print("configuration.py: error: argument --transposition: requires the packed engine: use '--engine packed'")
+    sys.exit()
+if args.transposition > 0 and args.cache is not None:
+    print("configuration.py: error: argument --transposition: not allowed with argument --cache")
+    sys.exit()
+if args.strategy != 'default' and args.engine != 'packed':
+    print("configuration.py: error: argument --strategy: requires the packed engine: use '--engine packed'")
+    sys.exit()
+if args.stats and args.engine not in ['dict', 'packed']:
+    print("configuration.py: error: argument --stats: requires the dict or packed engine: use '--engine dict' or '--engine packed'")
+    sys.exit()
+if args.progress < 0:
+    print("configuration.py: error: argument --progress: must be at least 0")
+    sys.exit()
+if args.engine == 'vectorized' and vectorized.numpy is None:
+    print("configuration.py: error: argument --engine: the vectorized engine requires NumPy: use 'pip install numpy'")
+    sys.exit()
+
 # if the range is provided, then check for valid selection
 if args.range is not None:
     a = args.range[0]
@@ -140,35 +200,41 @@ if args.range is not None:
     if a > b:
         print("configuration.py: error: argument --range: invalid argument value order")
         sys.exit()
-    elif a == b:
-        print("configuration.py: error: argument --range: argument values cannot be equal")
-        sys.exit()
     elif (a < 1) or (b > totalGames):
         print("configuration.py: error: argument --range: invalid argument values: choose from [{}, {}] (inclusive)".format(1, totalGames))
         sys.exit()
-
-    # determine the game start and end sections
-    for s in range(1, size+1):
-        # print("Checking Interval: "+str((s-1)*gamesPerSection+1)+", "+str(s*gamesPerSection))
-        if (s-1)*gamesPerSection+1 <= a <= s*gamesPerSection:
-            # print("a in section: "+str(s))
-            currentSection = s
-            startingZeroPosition = s
-        if (s-1)*gamesPerSection+1 <= b <= s*gamesPerSection:
-            # print("b in section: "+str(s))
-            endingZeroPosition = s
-            break
 else:
     # if the range is not provided, then play all the games
     a = 1
     b = totalGames
-    currentSection = 1
-    startingZeroPosition = 1
-    endingZeroPosition = size
+
+# if a shard is provided, then play only its part of the range
+# the whole range is kept, to describe the sweep that the shard is a part of
+if args.shard is not None:
+    shardIndex = args.shard[0]
+    shardCount = args.shard[1]
+
+    if args.output != 'jsonl':
+        print("configuration.py: error: argument --shard: requires the jsonl output: use '-o jsonl'")
+        sys.exit()
+    elif (shardIndex < 1) or (shardIndex > shardCount):
+        print("configuration.py: error: argument --shard: invalid argument values: choose k from [{}, N] (inclusive)".format(1))
+        sys.exit()
+    elif shardCount > b-a+1:
+        print("configuration.py: error: argument --shard: invalid argument values: more shards than games: {}".format(b-a+1))
+        sys.exit()
+
+    sweepRange = [a, b]
+    a, b = shard.shardRange(a, b, shardIndex, shardCount)
+
+# determine the game start and end sections, i.e., the zero positions of the first and last game
+startingZeroPosition = (a-1) // gamesPerSection + 1
+endingZeroPosition = (b-1) // gamesPerSection + 1
+currentSection = startingZeroPosition
 
 # create the file name for this game
 # warning: if a file with the same name exists, it will override that file
-fileName = "{}-ti({})-zi({})-ri[{}-{}].xlsx"
+fileName = "{}-ti({})-zi({})-ri[{}-{}]." + args.output
 if args.e:
     fileName = fileName.format('peg-solitaire', sizeDescription, n, a, b)
     fileName = fileName.replace('ti', typeDescriptive).replace('zi', "colorset").replace('ri', "range")
@@ -200,97 +266,145 @@ if args.dry_run:
     print("Sections: {}".format(int(totalGames / gamesPerSection)))
     sys.exit()
 
-# open the workbook and add a worksheet (additionally, set text formatting)
-# begin row at 0
-workbook = xlsxwriter.Workbook(fileName)
-worksheet = workbook.add_worksheet()
-right = {'align':'right'}
-bold = {'bold':True}
-border = {'border':True}
-borderColor = {'border_color':"gray"}
-cellBackgroundColor = {'bg_color':'#D0D0D0'}
-row = 3
+# set the function that plays a game with the chosen engine
+# the configurations seen while playing are not needed for a sweep, so the dict and packed engines let them go as soon as a game ends
+# the packed engine builds the table of the graph once, for all games, in a solver that holds its own color set (see solver.py)
+# with a transposition table, every process keeps the results of the positions of its games for the games after them
+# the table engine solves every position of the graph once, then every game is looked up
+# the vectorized engine builds the arrays of the graph once, for all games
+# with --prune, the packed engine checks every position found in its solver
+if args.engine == 'packed':
+    play = solver.Solver(G, n, args.strategy, args.cache, args.cache_size, transposition_size=args.transposition, prune=args.prune)
+elif args.engine == 'table':
+    print("Solving All Positions... ", end="", flush=True)
+    solvedGraph = retrograde.solve_graph(G, n)
+    print("Done. ({} winnable positions)".format(len(solvedGraph['distance'])))
+    print("")
+    play = functools.partial(retrograde.is_winnable, solved=solvedGraph)
+elif args.engine == 'vectorized':
+    play = functools.partial(vectorized.is_winnable, table=vectorized.build_table(G, n))
+else:
+    play = game.solve
+
+# with the other engines, the games that can never be won are lost without playing them
+# count the positions rejected by every rule
+if args.prune:
+    pruner = pruning.build_pruner(G, n)
+    if args.engine == 'dict':
+        play = functools.partial(pruning.solve, pruner=pruner, play=play)
+    elif args.engine != 'packed':
+        play = functools.partial(pruning.is_winnable, pruner=pruner, play=play)
+    prunedStates = {rule: 0 for rule in pruning.rules}
+
+# find the automorphisms of the graph, if symmetric configurations should be played once
+# find the color automorphisms of Z_n, if configurations with multiplied peg values should be played once
+# keep the result of every set of symmetric configurations already played, until its last configuration comes up
+if args.symmetry or args.color_symmetry:
+    generators, automorphismCount = symmetry.find_generators(G) if args.symmetry else ([], 1)
+    colorGenerators, colorAutomorphismCount = symmetry.find_color_generators(n) if args.color_symmetry else ([], 1)
+    symmetricSolved = {}
+    if args.symmetry:
+        print("Automorphisms: {}".format(automorphismCount))
+    if args.color_symmetry:
+        print("Color Automorphisms: {}".format(colorAutomorphismCount))
+    print("")
+
+# the configurations seen by every game are also counted for the states per second of the progress, if the engine can count them
+# only this count is kept (see game.solve), which does not slow down the games as the statistics do, and it is not written to the results file
+# the positions rejected by every rule are counted the same way
+collectStats = args.stats
+if not args.stats and (args.progress > 0 or args.metrics is not None or args.prune) and args.engine in ['dict', 'packed']:
+    collectStats = 'seen'
+
+# start the worker processes, if more than one is requested
+pool = None
+if args.workers > 1:
+    pool = sweep.makePool(args.workers, G, n, play, collectStats)
+
+# open the results file, every game is written to it as soon as it is played
+# for the xlsx output, the results file is turned into the xlsx file at the end
+# collect the statistics in a summary sheet
+resultFileName = fileName[:-len(args.output)] + 'jsonl'
+sweepDescription = {'type': typeDescriptive, 'size': size, 'n': n, 'range': [a, b]}
+if args.shard is not None:
+    sweepDescription['graph'] = str(sizeDescription)
+    sweepDescription['shard'] = {'index': shardIndex, 'count': shardCount, 'range': sweepRange}
+summary = output.SummarySheet()
 
 # set counter to determine number of games won
 # set counter to determine number of games lost
 # set counter for the current game
-# use the stopwatch to time playing games
-# the outer 'for loop' sets the vertex position of the zero
-# the inner 'for loop' sets the configuration for the program to play
+# set the time spent by earlier runs of this sweep
 wonGames = 0
 lostGames = 0
 gameIndex = a
-with factory.stopwatch(worksheet, workbook.add_format(right)):
+elapsed = 0
+
+# the checkpoint holds the last game written to the results file, the counters, and the size of the results file at that game
+# to resume, the results file is cut back to that size and the sweep continues with the next game
+checkpointFileName = resultFileName + '.checkpoint'
+if args.resume:
+    checkpoint = output.readCheckpoint(checkpointFileName)
+    if checkpoint is None or checkpoint['sweep'] != sweepDescription:
+        print("configuration.py: error: argument --resume: no checkpoint found for this sweep: {}".format(checkpointFileName))
+        sys.exit()
+
+    wonGames = checkpoint['won']
+    lostGames = checkpoint['lost']
+    if args.prune and checkpoint.get('pruned') is None:
+        print("configuration.py: error: argument --resume: the checkpoint was saved without --prune: {}".format(checkpointFileName))
+        sys.exit()
+    if args.prune:
+        prunedStates.update(checkpoint['pruned'])
+    gameIndex = checkpoint['game'] + 1
+    elapsed = checkpoint['elapsed']
+    startingZeroPosition = (gameIndex-1) // gamesPerSection + 1
+    currentSection = startingZeroPosition
+    resultWriter = output.ResultWriter(resultFileName, sweepDescription, checkpoint['offset'])
+    print("Resuming at Game: {}".format(gameIndex))
+    print("")
+else:
+    resultWriter = output.ResultWriter(resultFileName, sweepDescription)
+
+# report the progress of the sweep every so often, if asked for
+# the games of the range before the one it starts at (when resumed) count as played
+reporter = None
+if args.progress > 0 or args.metrics is not None:
+    reporter = progress.ProgressReporter(a, b, args.progress if args.progress > 0 else 10, fileName[:-len(args.output)-1], args.metrics, args.progress > 0, gameIndex, wonGames, lostGames, elapsed)
+
+# use the stopwatch to time playing games
+# the outer 'for loop' sets the vertex position of the zero
+# the inner 'for loop' sets the configuration for the program to play
+startTime = time.time()
+lastCheckpointTime = startTime
+with factory.stopwatch(summary, None, elapsed):
     print("Processing:")
     for zeroPosition in range(startingZeroPosition, endingZeroPosition+1):
-        # if 'a' and 'b' exist in the same section, play the desired games
-        # if 'a' and 'b' exist in different sections, play the desired starting game, the desired ending game, and all games in between
-        if startingZeroPosition == endingZeroPosition:
-            # 'a' should not be the right endpoint of the section
-            # 'b' should not be the left endpoint of the section
-            alpha = a % gamesPerSection
-            alpha = alpha if alpha != 0 else alpha
-            beta = b % gamesPerSection
-            beta = beta if beta != 0 else gamesPerSection
-        elif zeroPosition == startingZeroPosition:
-            # 'a' can be the right endpoint of the section
-            alpha = a % gamesPerSection
-            alpha = alpha if alpha != 0 else gamesPerSection
-            beta = gamesPerSection
-        elif zeroPosition == endingZeroPosition:
-            # 'b' can be the left endpoint of the section
-            alpha = 1
-            beta = b % gamesPerSection
-            beta = beta if beta != 0 else gamesPerSection
-        else:
-            alpha = 1
-            beta = gamesPerSection
+        # play the games of the range that are in this section
+        sectionFirst = max(gameIndex, (zeroPosition-1)*gamesPerSection + 1)
+        sectionLast = min(b, zeroPosition*gamesPerSection)
 
         # find the configurations based on the zero position
+        # the configurations are made one at a time, as they are played
         print("Configuration Section ({}): ".format(currentSection), end="", flush=True)
-        configurations = factory.buildConfigurations(size, n, zeroPosition, alpha, beta)
+        if reporter is not None:
+            reporter.startSection(currentSection)
+        configurations = factory.generateConfigurations(size, n, sectionFirst, sectionLast)
+
+        # hand out the configurations in chunks that keep every worker busy, if not specified
+        chunkSize = args.chunk if args.chunk > 0 else max(1, min(64, (sectionLast - sectionFirst + 1) // (args.workers * 4)))
+        if args.symmetry or args.color_symmetry:
+            results = sweep.playSymmetricConfigurations(configurations, G, n, play, generators, symmetricSolved, pool, chunkSize, (a, b), collectStats, colorGenerators)
+        else:
+            results = sweep.playConfigurations(configurations, G, play, pool, chunkSize, collectStats)
 
         print("Playing... ", end="", flush=True)
-        for config in configurations:
-            # write a header-like row in the excel file for the current game
-            worksheet.set_row(row, cell_format=factory.makeSheetCellFormat(workbook, bold, cellBackgroundColor, border, borderColor))
-            worksheet.write(row, 0, "Game")
-            worksheet.write(row, 1, gameIndex)
-            row += 1
-
-            # show current game, update the row index
-            factory.writeConfigurationToSheet(config, row, worksheet)
-            row += 1
+        for config, result, sequence, stats in results:
+            # write the game, with its configuration, result, the series of moves that won the game (if any), and its statistics (if collected)
+            resultWriter.writeGame(gameIndex, config, result, sequence, stats if args.stats else None)
 
-            # format the 'win' row
-            worksheet.write(row, 0, "Win", workbook.add_format(bold))
-
-            # play the game
-            result, sequence, seen = game.is_winnable(G, config)
-
-            # show if the game won
-            worksheet.write(row, 1, str(result), factory.makeSheetCellFormat(workbook, bold, right))
-            row += 1
-
-            # write the vertex labels for the graph, if game is winnable
-            if result == True:
-                worksheet.set_row(row, cell_format=factory.makeSheetCellFormat(workbook, border, borderColor, right))
-                for vertex in range(1, size+1):
-                    worksheet.write(row, vertex-1, "vertex: "+str(vertex))
-
-                row += 1
-
-            # show series of moves that won the game, if any
-            for c in sequence:
-                factory.writeConfigurationToSheet(c, row, worksheet)
-                row += 1
-
-            # show the games that the program found while playing
-            # worksheet.write(row, 0, "Seen List")
-            # row += 1
-            # for c in seen:
-            #     factory.writeConfigurationToSheet(c, row, worksheet)
-            #     row += 1
+            # the games that the program found while playing (the 'seen' list) are not kept for a sweep
+            # use game.is_winnable directly, as in main.py, to show them
 
             # increase won/lost counter
             if result == True:
@@ -298,48 +412,96 @@ with factory.stopwatch(worksheet, workbook.add_format(right)):
             else:
                 lostGames += 1
 
+            # count the positions rejected by every rule while playing the game
+            # the table and vectorized engines count nothing, so a lost game whose first position a rule rejects counts once
+            if args.prune:
+                if stats is not None and 'pruned' in stats:
+                    for rule in stats['pruned']:
+                        prunedStates[rule] += stats['pruned'][rule]
+                elif args.engine not in ['dict', 'packed'] and result == False:
+                    rule = pruning.check(pruner, packed.pack(pruner['table'], config))
+                    if rule is not None:
+                        prunedStates[rule] += 1
+
+            # save a checkpoint every so often
+            if time.time() - lastCheckpointTime >= args.checkpoint:
+                lastCheckpointTime = time.time()
+                output.writeCheckpoint(checkpointFileName, {'sweep': sweepDescription, 'game': gameIndex, 'won': wonGames, 'lost': lostGames, 'pruned': prunedStates if args.prune else None, 'elapsed': elapsed + lastCheckpointTime - startTime, 'offset': resultWriter.tell()})
+
+            # count the game in the progress of the sweep
+            if reporter is not None:
+                reporter.update(result, stats)
+
             # increase current game counter
             gameIndex += 1
-            row += 1
 
         currentSection += 1
         print("Done.")
 
+    # report the progress once more, with every game played
+    if reporter is not None:
+        gamesPerSecond = reporter.finish()
+
     print("")
     print("Calculating Time... Done.")
-    print("Saving xlsx File... Done.")
+    print("Saving {} File... Done.".format(args.output))
     print("")
     print("Statistics:")
 
-# row, column
-worksheet.set_row(0, cell_format=factory.makeSheetCellFormat(workbook, bold, cellBackgroundColor, border, borderColor))
+# stop the worker processes
+if pool is not None:
+    pool.close()
+    pool.join()
 
-worksheet.write(0, 0, "Total")
-worksheet.write(1, 0, totalGames)
+# row, column
+summary.write(0, 0, "Total")
+summary.write(1, 0, totalGames)
 print("Total: {}".format(totalGames))
 
-worksheet.write(0, 1, "Played")
-worksheet.write(1, 1, b-a+1)
+summary.write(0, 1, "Played")
+summary.write(1, 1, b-a+1)
 print("Played: {}".format(b-a+1))
 
-worksheet.write(0, 2, "Won")
-worksheet.write(1, 2, wonGames)
+summary.write(0, 2, "Won")
+summary.write(1, 2, wonGames)
 print("Won: {}".format(wonGames))
 
-worksheet.write(0, 3, "Lost")
-worksheet.write(1, 3, lostGames)
+summary.write(0, 3, "Lost")
+summary.write(1, 3, lostGames)
 print("Lost: {}".format(lostGames))
 
-worksheet.write(0, 4, "Size")
-worksheet.write(1, 4, size)
+summary.write(0, 4, "Size")
+summary.write(1, 4, size)
 print("Size: {}".format(size))
 
-worksheet.write(0, 5, "Span")
-worksheet.write(1, 5, gamesPerSection)
+summary.write(0, 5, "Span")
+summary.write(1, 5, gamesPerSection)
 print("Span: {}".format(gamesPerSection))
 
-worksheet.write(0, 6, "Sections")
-worksheet.write(1, 6, int(totalGames / gamesPerSection))
+summary.write(0, 6, "Sections")
+summary.write(1, 6, int(totalGames / gamesPerSection))
 print("Sections: {}".format(int(totalGames / gamesPerSection)))
 
-workbook.close()
+# the average speed of this run, with the progress
+if reporter is not None:
+    print("Speed: {:.1f} games/s".format(gamesPerSecond))
+
+# the columns after the time show the positions rejected by every rule
+if args.prune:
+    for column, rule in enumerate(pruning.rules, 10):
+        summary.write(0, column, "Pruned ({})".format(rule))
+        summary.write(1, column, prunedStates[rule])
+        print("Pruned ({}): {}".format(rule, prunedStates[rule]))
+
+# save a checkpoint at the last game, before the statistics are written
+output.writeCheckpoint(checkpointFileName, {'sweep': sweepDescription, 'game': b, 'won': wonGames, 'lost': lostGames, 'pruned': prunedStates if args.prune else None, 'elapsed': elapsed + time.time() - startTime, 'offset': resultWriter.tell()})
+resultWriter.writeSummary(summary)
+resultWriter.close()
+
+# turn the results file into the xlsx file
+if args.output == 'xlsx':
+    output.exportToXlsx(resultFileName, fileName)
+    os.remove(resultFileName)
+
+# the sweep is complete, so its checkpoint is not needed anymore
+os.remove(checkpointFileName)
@@ -88,6 +88,84 @@ def buildConfigurations(size, n, zero=1, alpha=0, beta=0):
 
     return configList
 
+# the following function finds the configuration of the game with the given number, for the given graph size and color set
+# the games are numbered as in buildConfigurations: all the games of the first section (the zero at the first vertex), then the second, and so on
+# within a section, the colors of the vertices without the zero count the games (in base n-1), where the last vertex changes the fastest
+def gameToConfiguration(gameIndex, size, n):
+    if size <= 1:
+        return {1:0}
+
+    gamesPerSection = (n-1) ** (size-1)
+    if gameIndex < 1 or gameIndex > gamesPerSection * size:
+        raise ValueError("The game number must be an integer value between [1, {}] inclusive".format(gamesPerSection * size))
+
+    zero = (gameIndex-1) // gamesPerSection + 1
+    place = (gameIndex-1) % gamesPerSection
+
+    configuration = {}
+    for vertex in range(size, 0, -1):
+        if vertex == zero:
+            configuration[vertex] = 0
+        else:
+            configuration[vertex] = place % (n-1) + 1
+            place //= n-1
+
+    return {vertex: configuration[vertex] for vertex in range(1, size+1)}
+
+# the following function finds the number of the game with the given configuration, for the given color set
+# it is the inverse of gameToConfiguration
+def configurationToGame(configuration, n):
+    size = len(configuration)
+    if size <= 1:
+        return 1
+
+    zeros = [vertex for vertex in configuration if configuration[vertex] == 0]
+    if len(zeros) != 1:
+        raise ValueError("The configuration must have exactly one empty vertex")
+
+    place = 0
+    for vertex in range(1, size+1):
+        if vertex != zeros[0]:
+            place = place * (n-1) + configuration[vertex] - 1
+
+    return (zeros[0]-1) * (n-1) ** (size-1) + place + 1
+
+# the following function yields the configurations of the games numbered from "first" to "last" (inclusive), one at a time
+# the first configuration is found directly from its number (see gameToConfiguration), so no configuration before it is built
+def generateConfigurations(size, n, first=1, last=None):
+    if size <= 1:
+        yield {1:0}
+        return
+
+    last = (n-1) ** (size-1) * size if last is None else last
+
+    # find the zero position (section) of the first game, and the colors of the other vertices
+    configuration = gameToConfiguration(first, size, n)
+    zero = [vertex for vertex in configuration if configuration[vertex] == 0][0]
+    colors = [configuration[vertex] for vertex in configuration if vertex != zero]
+
+    for gameIndex in range(first, last+1):
+        configuration = {}
+        offset = 0
+        for vertex in range(1, size+1):
+            if vertex == zero:
+                offset = 1
+                configuration[vertex] = 0
+            else:
+                configuration[vertex] = colors[vertex-1-offset]
+
+        yield configuration
+
+        # count up to the next game, moving the zero to the next vertex after the last game of a section
+        i = size-2
+        while i >= 0 and colors[i] == n-1:
+            colors[i] = 1
+            i -= 1
+        if i >= 0:
+            colors[i] += 1
+        else:
+            zero += 1
+
 # the following function generates a path graph
 # the second argument specifies the index to which the graph starts labeling
 def makePathGraph(size, start=1):
@@ -221,6 +299,10 @@ def makeCaterpillarGraph(pendants, start=1):
     size = len(pendants)
     graph = makePathGraph(size, start)
 
+    # a path of a single vertex has two vertices, so the second one is removed (it would be left without an edge back)
+    if size == 1:
+        graph = {start:[]}
+
     index = size+start-1
     for vertex in range(start, size+start):
         for i in range(1, pendants[vertex-start] + 1):
@@ -229,9 +311,6 @@ def makeCaterpillarGraph(pendants, start=1):
             kv = {index:[vertex]}
             graph.update(kv)
 
-    if size == 1:
-        graph[start].remove(start+1)
-
     # print(graph)
     return graph
 
@@ -403,6 +482,9 @@ def makeGeneralizedPetersenGraph(size, step, start=1):
 
 # the following function generates a barbell graph
 def makeBarbellGraph(bellSize, start=1):
+    if bellSize < 2:
+        raise ValueError("Size must be greater than or equal to 2")
+
     leftBell = makeCompleteGraph(bellSize, start)
     rightBell = makeCompleteGraph(bellSize, bellSize+start)
 
@@ -532,9 +614,10 @@ def makeTreeGraph(roots, start=1):
 
 # the following function will time how long a block of code took to execute
 # the time is logged to the results screen and to the excel file
+# the time (in seconds) spent before, e.g., by an interrupted run, can be added with "elapsed"
 @contextlib.contextmanager
-def stopwatch(timesheet, align):
-    t0 = time.time()
+def stopwatch(timesheet, align, elapsed=0):
+    t0 = time.time() - elapsed
     try:
         yield
     finally:
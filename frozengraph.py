@@ -0,0 +1,94 @@
+# name: frozengraph
+# description: Python Script that turns a graph made by factory.py into a compact graph that cannot be changed, with constant time adjacency tests
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# a frozen graph is still a dictionary that maps every vertex to its connected vertices, in the same order as the graph it was made from
+# so every engine (game.py, packed.py, ...) plays it the same way, but the connected vertices of a vertex are a read-only view
+# where 'v in Graph[u]' takes constant time instead of going through a list (e.g., in game.execute_move)
+#
+# every vertex also has a dense index (from 0, in sorted order): the same index as the bits of the vertex in a packed position (see packed.py)
+# and the place of its peg value in a key of symmetry.py, and the graph is kept as:
+#   'offsets' and 'targets': the connected vertices (by index) of the vertex with index i are targets[offsets[i]:offsets[i+1]], in the order of the graph
+#   'adjacency': for every vertex index, an integer with the bit of every connected vertex index set
+#   'fingerprint': the same fingerprint as cache.fingerprint, found once
+# packed.build_jumps finds the jumps of the graph from 'offsets' and 'targets', and symmetry.find_automorphism tests edges with 'adjacency'
+#
+# a graph is checked when it is frozen, as these problems waste search time without changing the results:
+#   a vertex connected to itself, a vertex connected to the same vertex twice, a connected vertex that is not a vertex of the graph,
+#   and an edge listed on one side only (u lists v, but v does not list u)
+
+import array
+import types
+
+import cache
+
+# the following class is a graph made from a given "Graph" (a dictionary, as made by factory.py) that cannot be changed
+# a ValueError is raised if the graph has one of the problems listed above
+class FrozenGraph(dict):
+    def __init__(self, Graph):
+        vertices = sorted(Graph)
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+
+        for vertex in Graph:
+            seen = set()
+            for connected_vertex in Graph[vertex]:
+                if connected_vertex == vertex:
+                    raise ValueError("graph: vertex {} is connected to itself".format(vertex))
+                if connected_vertex not in index:
+                    raise ValueError("graph: vertex {} is connected to {}, which is not a vertex of the graph".format(vertex, connected_vertex))
+                if connected_vertex in seen:
+                    raise ValueError("graph: vertex {} is connected to {} more than once".format(vertex, connected_vertex))
+                if vertex not in Graph[connected_vertex]:
+                    raise ValueError("graph: vertex {} is connected to {}, but not the other way around".format(vertex, connected_vertex))
+                seen.add(connected_vertex)
+
+        # the connected vertices of every vertex, in the same order, as keys of a read-only dictionary
+        super().__init__((vertex, types.MappingProxyType(dict.fromkeys(Graph[vertex]))) for vertex in Graph)
+
+        self.vertices = vertices
+        self.index = index
+        self.offsets = array.array('l', [0])
+        self.targets = array.array('l')
+        self.adjacency = []
+        for vertex in vertices:
+            bitset = 0
+            for connected_vertex in Graph[vertex]:
+                self.targets.append(index[connected_vertex])
+                bitset |= 1 << index[connected_vertex]
+            self.offsets.append(len(self.targets))
+            self.adjacency.append(bitset)
+        self.fingerprint = cache.fingerprint(Graph)
+
+    # the following function checks whether the vertices "u" and "v" are connected, in constant time
+    def adjacent(self, u, v):
+        return (self.adjacency[self.index[u]] >> self.index[v]) & 1 == 1
+
+    # the following function returns the indices of the vertices connected to the vertex with index "i"
+    def neighbors(self, i):
+        return self.targets[self.offsets[i]:self.offsets[i+1]]
+
+    # the following function returns the number of vertices connected to the given "vertex"
+    def degree(self, vertex):
+        i = self.index[vertex]
+        return self.offsets[i+1] - self.offsets[i]
+
+    # a frozen graph cannot be changed
+    def readOnly(self, *args, **kwargs):
+        raise TypeError("a frozen graph cannot be changed")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = readOnly
+
+    # a frozen graph is copied as a dictionary of lists, as made by factory.py, which can be changed
+    def copy(self):
+        return {vertex: list(self[vertex]) for vertex in self}
+
+    # a frozen graph is pickled as the dictionary it was made from (e.g., for a pool of worker processes)
+    def __reduce__(self):
+        return (FrozenGraph, (self.copy(),))
+
+# the following function freezes a given "Graph", and returns a frozen graph as it is
+def freeze(Graph):
+    if isinstance(Graph, FrozenGraph):
+        return Graph
+    return FrozenGraph(Graph)
@@ -3,6 +3,8 @@
 # author: Dr. Matthew Rathbun, Gustavo Sopena
 # date started: Monday: July 20, 2020
 
+import time
+
 # the number of colors available for playing
 # in principle, the game can be easily changed to accommodate Z_n, by simply changing this parameter
 n = 3
@@ -81,77 +83,130 @@ def satisfies_win_condition(Configuration):
     else:
         raise Exception("All vertices contain a zero peg value.")
 
-# the following workhorse function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves
-# it returns a boolean value denoting if a 'sequence' of configurations was found, and every configuration 'seen' during the play-through
-def is_winnable(Graph, Configuration):
-    # a list of lists, where each inner list consists of a "Configuration" of the "Graph" and its depth in the outer list (main list)
-    # a list of configurations 'seen' during the play-through
-    # the iterator traversing forwards in the main list
-    # the boolean value that determines whether a configuration satisfied the win condition
-    # the current item from the main list
-    # the depth of the current item
-    # the index of the current item
-    main_list = [[Configuration, 0]]
-    seen = [Configuration]
-    item = iter(main_list)
-    did_satisfy_win_condition = False
-    current_item = None
-    current_depth = 0
-    current_index = 0
-
-    while True:
-        try:
-            current_item = next(item)
-            current_depth = current_item[1]
-        except StopIteration as stop_iteration_error:
+# the following workhorse function plays a "Graph" with "Configuration" until a configuration satisfies the win condition, or none are left
+# it returns the winning configuration (or None), and a dictionary that maps the key of every configuration 'seen' to the key of the configuration it came from
+# a key is the tuple of peg values of a configuration, in the order of the vertices of the "Configuration"
+# if a "stats" dictionary is given, then it is filled with how hard the game was to play:
+#   'expanded': the number of configurations whose moves were played
+#   'moves': the number of moves found
+#   'duplicates': the number of configurations found again, and not played again
+#   'frontier': the largest number of configurations waiting to be played
+#   'depth': the largest number of moves from the given configuration to a configuration seen
+#   'seen': the number of configurations seen
+#   'time': the seconds spent in every phase: 'win' (satisfies_win_condition), 'moves' (build_moves), 'execute' (execute_all_moves), and 'filter' (finding the configurations already seen)
+def search(Graph, Configuration, stats=None):
+    # a key (unlike the dictionary itself) can be hashed
+    # a dictionary that maps the key of every configuration 'seen' during the play-through to the key of the configuration it came from
+    # a stack of configurations to play next, where the next configuration to play is at the end
+    # the configuration that satisfied the win condition, if any
+    parents = {tuple(Configuration.values()): None}
+    stack = [Configuration]
+    winning_configuration = None
+
+    # the statistics are only kept if they are asked for, the depth of every configuration is kept by its key
+    if stats is not None:
+        stats.update({'expanded': 0, 'moves': 0, 'duplicates': 0, 'frontier': 1, 'depth': 0})
+        times = {'win': 0.0, 'moves': 0.0, 'execute': 0.0, 'filter': 0.0}
+        depths = {tuple(Configuration.values()): 0}
+        clock = time.perf_counter
+
+    while len(stack) > 0:
+        current_configuration = stack.pop()
+
+        if stats is not None:
+            t0 = clock()
+        if satisfies_win_condition(current_configuration):
+            winning_configuration = current_configuration
             break
 
-        if satisfies_win_condition(current_item[0]):
-            did_satisfy_win_condition = True
-            current_index = main_list.index(current_item)
-            break
-
-        all_moves = build_moves(Graph, current_item[0])
+        if stats is not None:
+            t1 = clock()
+        all_moves = build_moves(Graph, current_configuration)
+        if stats is not None:
+            times['win'] += t1 - t0
+            times['moves'] += clock() - t1
+            stats['expanded'] += 1
+            stats['moves'] += len(all_moves)
         if len(all_moves) == 0:
             continue
 
+        current_key = tuple(current_configuration.values())
         filtered_configurations = []
-        all_configurations = execute_all_moves(Graph, current_item[0], all_moves)
+        if stats is not None:
+            t0 = clock()
+        all_configurations = execute_all_moves(Graph, current_configuration, all_moves)
+        if stats is not None:
+            t1 = clock()
 
         for cn in all_configurations:
-            if cn in seen:
+            key = tuple(cn.values())
+            if key in parents:
+                if stats is not None:
+                    stats['duplicates'] += 1
                 continue
             else:
-                seen.append(cn)
+                parents[key] = current_key
                 filtered_configurations.append(cn)
 
-        if len(filtered_configurations) == 0:
-            continue
+        # the new configurations are played (in order) before the rest of the stack
+        stack.extend(reversed(filtered_configurations))
 
-        current_index = main_list.index(current_item)
-        counter = 0
-        for fd_cn in filtered_configurations:
-            main_list.insert(current_index+counter+1, [fd_cn, current_depth+1])
-            counter += 1
+        if stats is not None:
+            times['execute'] += t1 - t0
+            times['filter'] += clock() - t1
+            depth = depths[current_key] + 1
+            for cn in filtered_configurations:
+                depths[tuple(cn.values())] = depth
+            stats['frontier'] = max(stats['frontier'], len(stack))
+            if len(filtered_configurations) > 0:
+                stats['depth'] = max(stats['depth'], depth)
 
-    # the 'sequence' list of configurations that results in a win
-    # the iterator traversing backwards in the main list
+    if stats is not None:
+        stats['seen'] = len(parents)
+        stats['time'] = times
+
+    return winning_configuration, parents
+
+# the following function builds the 'sequence' list of configurations that results in the given "winning_configuration"
+# it follows the parent of each configuration (see search) from the winning configuration back to the first one
+def follow_parents(parents, vertices, winning_configuration):
     sequence = []
-    if did_satisfy_win_condition:
-        sequence.append(current_item[0])
-        item = reversed(main_list[0:current_index])
+    key = tuple(winning_configuration.values())
+    while key is not None:
+        sequence.append(dict(zip(vertices, key)))
+        key = parents[key]
+    sequence.reverse()
 
-        counter = 0
-        while True:
-            current_item = next(item)
+    return sequence
 
-            if current_item[1] == (current_depth-counter)-1:
-                sequence.insert(0, current_item[0])
-                counter += 1
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves
+# it returns a boolean value denoting if a 'sequence' of configurations was found, and every configuration 'seen' during the play-through
+# if a "stats" dictionary is given, then it is filled as in search
+def is_winnable(Graph, Configuration, stats=None):
+    # the vertices of the configuration, in order, used to turn a key back into a configuration
+    vertices = list(Configuration)
+    winning_configuration, parents = search(Graph, Configuration, stats)
 
-            if current_item[1] == 0:
-                break
+    # every configuration 'seen' during the play-through, in the order it was found
+    seen = [dict(zip(vertices, key)) for key in parents]
 
-        return True, sequence, seen
+    if winning_configuration is not None:
+        return True, follow_parents(parents, vertices, winning_configuration), seen
+    else:
+        return False, [], seen
+
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves, like is_winnable
+# it returns the boolean value and the 'sequence' only: the configurations seen are kept as keys (tuples of peg values) while playing, and are let go at once
+# if "sequence" is False, then the 'sequence' is not built either, and None is returned in its place
+# if a "counts" dictionary is given, then only the number of configurations seen ('seen') is set in it, which (unlike the "stats") costs nothing while playing
+def solve(Graph, Configuration, sequence=True, stats=None, counts=None):
+    winning_configuration, parents = search(Graph, Configuration, stats)
+    if counts is not None:
+        counts['seen'] = len(parents)
+
+    if winning_configuration is None:
+        return False, [] if sequence else None
+    elif sequence:
+        return True, follow_parents(parents, list(Configuration), winning_configuration)
     else:
-        return False, sequence, seen
+        return True, None
@@ -0,0 +1,213 @@
+# name: output
+# description: Python Script that writes the results of a sweep as the games are played, and turns them into an xlsx file
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# the results file is a JSON Lines file: one JSON object per line
+# the first line describes the sweep, then every game has a line, and the last line holds the statistics (the summary)
+#   {"sweep": {"type": "path", "size": 5, "n": 3, "range": [1, 80]}}
+#   {"game": 1, "configuration": [0, 1, 1, 1, 1], "win": true, "sequence": [[0, 1, 1, 1, 1], ...]}
+# a game also has its statistics, if they were collected: "stats": {"expanded": 4, ..., "time": {"win": 0.0001, ...}}
+#   {"summary": {"Total": 80, "Played": 80, "Won": 42, ...}}
+# configurations are lists of peg values, in vertex order (vertex 1 first)
+
+import json
+import os
+import sys
+
+import factory
+
+# the following class writes the results of a sweep to the file at the given "path"
+# every game is written (and flushed) as soon as it is played, so nothing is kept in memory
+# if an "offset" is given (from a checkpoint), then the file is cut at the offset and the results are added after it
+class ResultWriter:
+    def __init__(self, path, sweep, offset=None):
+        self.path = path
+        if offset is None:
+            self.file = open(path, 'w')
+            self.writeLine({'sweep': sweep})
+        else:
+            self.file = open(path, 'r+')
+            self.file.truncate(offset)
+            self.file.seek(offset)
+
+    def writeLine(self, record):
+        self.file.write(json.dumps(record, separators=(',', ':')) + "\n")
+        self.file.flush()
+
+    # the following function writes a single game, with its number, configuration, result, winning sequence, and statistics (if any)
+    def writeGame(self, gameIndex, configuration, result, sequence, stats=None):
+        record = {'game': gameIndex, 'configuration': list(configuration.values()), 'win': result, 'sequence': [list(c.values()) for c in sequence]}
+        if stats is not None:
+            record['stats'] = stats
+        self.writeLine(record)
+
+    # the following function writes the statistics of the sweep, from the given summary sheet
+    def writeSummary(self, summary):
+        self.writeLine({'summary': summary.values()})
+
+    # the following function returns the size of the file written so far
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+# the following function writes the given "checkpoint" (a dictionary) to the file at the given "path"
+# the file is replaced at once, so an interrupted run never leaves a partial checkpoint behind
+# the checkpoint is first written to '<path>.tmp', which is removed if the write fails (and by readCheckpoint, if the run was killed)
+def writeCheckpoint(path, checkpoint):
+    try:
+        with open(path + '.tmp', 'w') as file:
+            json.dump(checkpoint, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + '.tmp', path)
+    finally:
+        if os.path.exists(path + '.tmp'):
+            os.remove(path + '.tmp')
+
+# the following function reads the checkpoint in the file at the given "path"
+# a '<path>.tmp' left by a run that was killed while writing its checkpoint is removed
+# it returns None if there is no checkpoint
+def readCheckpoint(path):
+    if os.path.exists(path + '.tmp'):
+        os.remove(path + '.tmp')
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+# the following class collects the statistics of a sweep, written as cells of a sheet
+# it has the same write function as an xlsx worksheet, so factory.stopwatch can write to it
+# the first row holds the names of the statistics, and the second row holds their values
+class SummarySheet:
+    def __init__(self):
+        self.cells = {}
+
+    def write(self, row, column, value, cellFormat=None):
+        self.cells[(row, column)] = value
+
+    # the following function returns a dictionary that maps the name of every statistic to its value, in column order
+    def values(self):
+        columns = sorted(column for row, column in self.cells if row == 0)
+        return {self.cells[(0, column)]: self.cells.get((1, column)) for column in columns}
+
+# the following function reads the records of the results file at the given "path", one at a time
+# a run that was stopped in the middle of a write leaves a partial last line (without its newline), which is skipped
+def readRecords(path):
+    with open(path) as file:
+        for line in file:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if line.endswith("\n"):
+                    raise
+                return
+            yield record
+
+# the following function lists the statistics of a game as (name, value) pairs, the time of every phase is named "time (phase)", and the positions rejected by every rule "pruned (rule)"
+def flattenStats(stats):
+    pairs = []
+    for name in stats:
+        if name == 'time':
+            for phase in stats['time']:
+                pairs.append(("time ({})".format(phase), "%.6f" % stats['time'][phase]))
+        elif name == 'pruned':
+            for rule in stats['pruned']:
+                pairs.append(("pruned ({})".format(rule), stats['pruned'][rule]))
+        else:
+            pairs.append((name, stats[name]))
+
+    return pairs
+
+# the following function turns the results file at the given "path" into an xlsx file, with the same layout as configuration.py has always made
+# the xlsx file is written one row at a time (xlsxwriter's constant memory mode), and every cell format is made once
+def exportToXlsx(path, xlsxPath):
+    import xlsxwriter
+
+    # the statistics are at the end of the results file, but go at the top of the xlsx file
+    summary = {}
+    for record in readRecords(path):
+        if 'summary' in record:
+            summary = record['summary']
+
+    workbook = xlsxwriter.Workbook(xlsxPath, {'constant_memory': True})
+    worksheet = workbook.add_worksheet()
+    right = {'align':'right'}
+    bold = {'bold':True}
+    border = {'border':True}
+    borderColor = {'border_color':"gray"}
+    cellBackgroundColor = {'bg_color':'#D0D0D0'}
+    headerFormat = factory.makeSheetCellFormat(workbook, bold, cellBackgroundColor, border, borderColor)
+    boldFormat = factory.makeSheetCellFormat(workbook, bold)
+    resultFormat = factory.makeSheetCellFormat(workbook, bold, right)
+    labelFormat = factory.makeSheetCellFormat(workbook, border, borderColor, right)
+    rightFormat = factory.makeSheetCellFormat(workbook, right)
+
+    # row, column
+    worksheet.set_row(0, cell_format=headerFormat)
+    for column, name in enumerate(summary):
+        worksheet.write(0, column, name)
+    for column, name in enumerate(summary):
+        if name.startswith("Time"):
+            worksheet.write(1, column, summary[name], rightFormat)
+        else:
+            worksheet.write(1, column, summary[name])
+
+    row = 3
+    for record in readRecords(path):
+        if 'game' not in record:
+            continue
+
+        # write a header-like row in the excel file for the current game
+        # the statistics of the game (if any) follow the game number, as pairs of name and value
+        worksheet.set_row(row, cell_format=headerFormat)
+        worksheet.write(row, 0, "Game")
+        worksheet.write(row, 1, record['game'])
+        column = 2
+        for name, value in flattenStats(record.get('stats') or {}):
+            worksheet.write(row, column, name)
+            worksheet.write(row, column+1, value)
+            column += 2
+        row += 1
+
+        # show current game, update the row index
+        for column, pegColor in enumerate(record['configuration']):
+            worksheet.write(row, column, pegColor)
+        row += 1
+
+        # show if the game won
+        worksheet.write(row, 0, "Win", boldFormat)
+        worksheet.write(row, 1, str(record['win']), resultFormat)
+        row += 1
+
+        # write the vertex labels for the graph, if game is winnable
+        if record['win']:
+            worksheet.set_row(row, cell_format=labelFormat)
+            for column in range(len(record['configuration'])):
+                worksheet.write(row, column, "vertex: "+str(column+1))
+            row += 1
+
+        # show series of moves that won the game, if any
+        for c in record['sequence']:
+            for column, pegColor in enumerate(c):
+                worksheet.write(row, column, pegColor)
+            row += 1
+
+        row += 1
+
+    workbook.close()
+
+# the following lets a results file be turned into an xlsx file at any time, e.g.,
+# $ python3 output.py ps-p(5)-z(3)-r[1-80].jsonl
+if __name__ == '__main__':
+    if len(sys.argv) != 2 or not sys.argv[1].endswith('.jsonl'):
+        print("usage: output.py file.jsonl")
+        sys.exit()
+
+    xlsxPath = sys.argv[1][:-len('.jsonl')] + '.xlsx'
+    print("Generating File: {}".format(xlsxPath))
+    exportToXlsx(sys.argv[1], xlsxPath)
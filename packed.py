@@ -0,0 +1,791 @@
+# name: packed
+# description: The peg solitaire implementation, using configurations packed into a single integer
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# a configuration is packed into a 'position', an integer with a fixed number of bits for every vertex
+# the peg value of the vertex with index i (in sorted order) is stored in the bits [i*bits, (i+1)*bits)
+# every move that can ever be played on a graph is found once, in the 'table' of the graph
+
+import game
+import frozengraph
+import collections.abc
+import time
+from cache import fingerprint as cache_fingerprint
+from transposition import TranspositionTable
+
+# the following function builds every (from, over, to) triple of vertices for a given "Graph", as the dense indices of the vertices (see frozengraph.py)
+# the jumps are found from the connected vertices of the frozen graph, in the order of the graph (as game.build_moves finds the moves)
+def build_jumps(Graph):
+    Graph = frozengraph.freeze(Graph)
+    jumps = []
+
+    for vertex in Graph:
+        i = Graph.index[vertex]
+        for j in Graph.neighbors(i):
+            for k in Graph.neighbors(j):
+                # a peg can never jump back into the vertex it came from
+                if k != i:
+                    jumps.append((i, j, k))
+
+    return jumps
+
+# the following function builds the table used to play games on a given "Graph" with n colors
+# it returns a dictionary holding the vertices, the number of bits for every vertex, and the jumps as triples of bit offsets
+# the "jumps" of the graph (see build_jumps) can be given, as they are the same for every color set
+def build_table(Graph, n, jumps=None):
+    vertices = sorted(Graph)
+
+    # ceil(log2(n)) bits are enough to hold the peg values 0, 1, ..., n-1
+    bits = max(1, (n-1).bit_length())
+
+    # 'low' has the lowest bit of every vertex set, and is used to count the pegs of a position
+    low = 0
+    for i in range(len(vertices)):
+        low |= 1 << (i*bits)
+
+    if jumps is None:
+        jumps = build_jumps(Graph)
+    jumps = [tuple(i*bits for i in jump) for jump in jumps]
+
+    # the jumps of every vertex (by its bit offset) as masks, where jump j of the list has the bit 1 << j:
+    # the jumps that start from the vertex, the jumps over the vertex, and the jumps that land on the vertex (see occupied_jumps)
+    jumps_from = {i*bits: 0 for i in range(len(vertices))}
+    jumps_over = {i*bits: 0 for i in range(len(vertices))}
+    jumps_to = {i*bits: 0 for i in range(len(vertices))}
+    for j, jump in enumerate(jumps):
+        jumps_from[jump[0]] |= 1 << j
+        jumps_over[jump[1]] |= 1 << j
+        jumps_to[jump[2]] |= 1 << j
+
+    return {'n': n, 'vertices': vertices, 'bits': bits, 'mask': (1 << bits) - 1, 'low': low, 'jumps': jumps, 'jumps_from': jumps_from, 'jumps_over': jumps_over, 'jumps_to': jumps_to}
+
+# the following function packs a given "Configuration" into a position
+def pack(table, Configuration):
+    position = 0
+    bits = table['bits']
+
+    for i, vertex in enumerate(table['vertices']):
+        position |= Configuration[vertex] << (i*bits)
+
+    return position
+
+# the following function unpacks a given "position" into a configuration
+def unpack(table, position):
+    configuration = {}
+    bits = table['bits']
+    mask = table['mask']
+
+    for i, vertex in enumerate(table['vertices']):
+        configuration[vertex] = (position >> (i*bits)) & mask
+
+    return configuration
+
+# the following function builds all the possible moves for a given "position"
+# it returns a list of (from, over, to) triples of bit offsets, taken from the table
+def build_moves(table, position):
+    mask = table['mask']
+    possible_moves = []
+
+    for jump in table['jumps']:
+        # the first and second vertex must have a peg, and the third vertex must NOT have a peg
+        if (position >> jump[0]) & mask and (position >> jump[1]) & mask and not (position >> jump[2]) & mask:
+            possible_moves.append(jump)
+
+    return possible_moves
+
+# the following function finds the jumps of the vertices of a given "position" that have a peg
+# it returns three masks of jumps (see build_table): the jumps that start from a peg, the jumps over a peg, and the jumps that land on a peg
+# a jump can be played when it starts from a peg and jumps over a peg, but does not land on one: the moves are "from & over & ~to"
+# the bits of the moves, taken from the lowest, are in the same order as build_moves
+def occupied_jumps(table, position):
+    mask = table['mask']
+    jumps_from = 0
+    jumps_over = 0
+    jumps_to = 0
+
+    for offset in table['jumps_from']:
+        if (position >> offset) & mask:
+            jumps_from |= table['jumps_from'][offset]
+            jumps_over |= table['jumps_over'][offset]
+            jumps_to |= table['jumps_to'][offset]
+
+    return jumps_from, jumps_over, jumps_to
+
+# the following function finds the jumps of the vertices of a given "position" that have a peg (see occupied_jumps),
+# from the "occupied" jumps of the position it came from after the given "Move"
+# the move empties the first vertex (and the second vertex, if its pegs add up to zero), and fills the third vertex
+# so only the jumps of those vertices change, instead of checking every vertex again
+# every jump starts from, jumps over, and lands on a single vertex, so the jumps of a vertex are added or removed on their own
+def update_jumps(table, position, occupied, Move):
+    jumps_from, jumps_over, jumps_to = occupied
+
+    emptied = [Move[0]]
+    if not (position >> Move[1]) & table['mask']:
+        emptied.append(Move[1])
+    for offset in emptied:
+        jumps_from &= ~table['jumps_from'][offset]
+        jumps_over &= ~table['jumps_over'][offset]
+        jumps_to &= ~table['jumps_to'][offset]
+
+    jumps_from |= table['jumps_from'][Move[2]]
+    jumps_over |= table['jumps_over'][Move[2]]
+    jumps_to |= table['jumps_to'][Move[2]]
+
+    return jumps_from, jumps_over, jumps_to
+
+# the following function executes a given "Move" on a given "position"
+# it returns the resulting position, the move is expected to come from build_moves
+def execute_move(table, position, Move):
+    mask = table['mask']
+    first = (position >> Move[0]) & mask
+    second = (position >> Move[1]) & mask
+
+    # remove the pegs from the first and second vertex
+    # place the jumping peg into the third vertex, and the sum of the two peg values (mod n) into the second vertex
+    position &= ~((mask << Move[0]) | (mask << Move[1]))
+    return position | (((first + second) % table['n']) << Move[1]) | (first << Move[2])
+
+# the following function finds every position that leads to the given "position" after a single move
+# a move (from, over, to) turns the pegs (a, b, 0) into (0, (a + b) % n, a), so it is undone when
+# the first vertex is empty, the third vertex has a peg a, and the second vertex has a peg c such that b = (c - a) % n is not zero
+def undo_moves(table, position):
+    n = table['n']
+    mask = table['mask']
+    previous_positions = []
+
+    for jump in table['jumps']:
+        if (position >> jump[0]) & mask:
+            continue
+        first = (position >> jump[2]) & mask
+        if first == 0:
+            continue
+        second = (((position >> jump[1]) & mask) - first) % n
+        if second == 0:
+            continue
+
+        previous_position = position & ~((mask << jump[1]) | (mask << jump[2]))
+        previous_positions.append(previous_position | (first << jump[0]) | (second << jump[1]))
+
+    return previous_positions
+
+# the following function counts the number of pegs of a given "position"
+def count_pegs(table, position):
+    # fold the bits of every vertex into its lowest bit, then count those
+    occupied = position
+    for shift in range(1, table['bits']):
+        occupied |= position >> shift
+
+    return bin(occupied & table['low']).count('1')
+
+# the following function checks whether the given "position" is in a state that is considered a win
+# it mirrors game.satisfies_win_condition
+def satisfies_win_condition(table, position):
+    peg_count = count_pegs(table, position)
+
+    if peg_count > 1:
+        return False
+    elif peg_count == 1:
+        return True
+    else:
+        raise Exception("All vertices contain a zero peg value.")
+
+# the following class is a read-only list of the configurations of the given "positions"
+# it keeps the positions as integers, and only unpacks a configuration when it is asked for
+class UnpackedPositions(collections.abc.Sequence):
+    def __init__(self, table, positions):
+        self.table = table
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [unpack(self.table, position) for position in self.positions[index]]
+        return unpack(self.table, self.positions[index])
+
+# the following function follows the "parents" of a position back to the first position
+# it returns the path of positions from the first position to the given "position"
+def follow_parents(parents, position):
+    path = []
+    while position is not None:
+        path.append(position)
+        position = parents[position]
+    path.reverse()
+
+    return path
+
+# the following function finds the largest number of moves from the first position to a position of the given "parents"
+# a position is always added to the parents after the position it came from
+def deepest(parents):
+    depths = {}
+    for position in parents:
+        parent = parents[position]
+        depths[position] = 0 if parent is None else depths[parent] + 1
+
+    return max(depths.values())
+
+# the following function fills the given "stats" dictionary (if any) with the counts of a search, see is_winnable
+def record(stats, expanded, moves, duplicates, frontier, depth):
+    if stats is not None:
+        stats.update({'expanded': expanded, 'moves': moves, 'duplicates': duplicates, 'frontier': frontier, 'depth': depth})
+
+# the following function searches for a win from the given "start" position
+# it plays the positions in the same order as game.is_winnable: every move of a position is found before any of them is played,
+# and the positions found are played (in order) before the positions found earlier
+# it returns the winning path of positions (or an empty list), and every position seen
+# if a "lookup" function is given, it is asked for the known result and winning line of the new positions found from every position
+# a position known to be not winnable is not played, and a position known to be winnable ends the search
+# if a "stats" dictionary is given, then it is filled with the counts of the search (see is_winnable)
+def search(table, start, lookup=None, stats=None):
+    n = table['n']
+    mask = table['mask']
+    low = table['low']
+    shifts = range(1, table['bits'])
+    jumps = table['jumps']
+
+    parents = {start: None}
+    stack = [start]
+    expanded = 0
+    moves = 0
+    frontier = 1
+
+    while len(stack) > 0:
+        current_position = stack.pop()
+
+        # count the pegs as in count_pegs, a win has exactly one peg
+        occupied = current_position
+        for shift in shifts:
+            occupied |= current_position >> shift
+        occupied &= low
+        if occupied & (occupied-1) == 0:
+            if occupied == 0:
+                raise Exception("All vertices contain a zero peg value.")
+            if stats is not None:
+                record(stats, expanded, moves, moves - len(parents) + 1, frontier, deepest(parents))
+            return follow_parents(parents, current_position), parents
+
+        expanded += 1
+        filtered_positions = []
+        for jump in jumps:
+            first = (current_position >> jump[0]) & mask
+            if first == 0:
+                continue
+            second = (current_position >> jump[1]) & mask
+            if second == 0 or (current_position >> jump[2]) & mask:
+                continue
+
+            # execute the move as in execute_move
+            moves += 1
+            position = current_position & ~((mask << jump[0]) | (mask << jump[1]))
+            position |= (((first + second) % n) << jump[1]) | (first << jump[2])
+            if position not in parents:
+                parents[position] = current_position
+                filtered_positions.append(position)
+
+        if lookup is not None and len(filtered_positions) > 0:
+            known = lookup(filtered_positions)
+            for position in filtered_positions:
+                if position in known and known[position][0]:
+                    if stats is not None:
+                        record(stats, expanded, moves, moves - len(parents) + 1, frontier, deepest(parents))
+                    return follow_parents(parents, position) + known[position][1], parents
+            filtered_positions = [position for position in filtered_positions if position not in known]
+
+        # the new positions are played (in order) before the rest of the stack
+        stack.extend(reversed(filtered_positions))
+        if len(stack) > frontier:
+            frontier = len(stack)
+
+    if stats is not None:
+        record(stats, expanded, moves, moves - len(parents) + 1, frontier, deepest(parents))
+    return [], parents
+
+# the following function searches for a win from the given "start" position, in the same order as search (and with the same result)
+# but the moves of every position are found from the occupied jumps of the position it came from (see update_jumps), instead of checking every jump of the table
+# every position on the stack keeps the occupied jumps of the position it came from, and the move that was played, until its own are found
+def search_incremental(table, start, lookup=None, stats=None):
+    n = table['n']
+    mask = table['mask']
+    low = table['low']
+    shifts = range(1, table['bits'])
+    jumps = table['jumps']
+
+    parents = {start: None}
+    stack = [(start, None, None)]
+    expanded = 0
+    moves = 0
+    frontier = 1
+
+    while len(stack) > 0:
+        current_position, parent_occupied, parent_move = stack.pop()
+
+        # count the pegs as in count_pegs, a win has exactly one peg
+        occupied = current_position
+        for shift in shifts:
+            occupied |= current_position >> shift
+        occupied &= low
+        if occupied & (occupied-1) == 0:
+            if occupied == 0:
+                raise Exception("All vertices contain a zero peg value.")
+            if stats is not None:
+                record(stats, expanded, moves, moves - len(parents) + 1, frontier, deepest(parents))
+            return follow_parents(parents, current_position), parents
+
+        expanded += 1
+        if parent_occupied is None:
+            occupied_now = occupied_jumps(table, current_position)
+        else:
+            occupied_now = update_jumps(table, current_position, parent_occupied, parent_move)
+
+        # play the moves from the lowest bit, which is the order of the jumps of the table
+        filtered_positions = []
+        remaining = occupied_now[0] & occupied_now[1] & ~occupied_now[2]
+        while remaining:
+            lowest = remaining & -remaining
+            remaining ^= lowest
+            jump = jumps[lowest.bit_length() - 1]
+
+            # execute the move as in execute_move
+            moves += 1
+            first = (current_position >> jump[0]) & mask
+            second = (current_position >> jump[1]) & mask
+            position = current_position & ~((mask << jump[0]) | (mask << jump[1]))
+            position |= (((first + second) % n) << jump[1]) | (first << jump[2])
+            if position not in parents:
+                parents[position] = current_position
+                filtered_positions.append((position, occupied_now, jump))
+
+        if lookup is not None and len(filtered_positions) > 0:
+            known = lookup([position for position, parent_occupied, jump in filtered_positions])
+            for position, parent_occupied, jump in filtered_positions:
+                if position in known and known[position][0]:
+                    if stats is not None:
+                        record(stats, expanded, moves, moves - len(parents) + 1, frontier, deepest(parents))
+                    return follow_parents(parents, position) + known[position][1], parents
+            filtered_positions = [entry for entry in filtered_positions if entry[0] not in known]
+
+        # the new positions are played (in order) before the rest of the stack
+        stack.extend(reversed(filtered_positions))
+        if len(stack) > frontier:
+            frontier = len(stack)
+
+    if stats is not None:
+        record(stats, expanded, moves, moves - len(parents) + 1, frontier, deepest(parents))
+    return [], parents
+
+# the following function finds every position that follows a given "position" (with "peg_count" pegs) after a single move
+# it returns a list of (position, peg count) pairs, where the moves that remove a peg come first
+def expand(table, position, peg_count):
+    n = table['n']
+    mask = table['mask']
+    removing = []
+    keeping = []
+
+    for jump in table['jumps']:
+        first = (position >> jump[0]) & mask
+        if first == 0:
+            continue
+        second = (position >> jump[1]) & mask
+        if second == 0 or (position >> jump[2]) & mask:
+            continue
+
+        total = (first + second) % n
+        child = position & ~((mask << jump[0]) | (mask << jump[1]))
+        child |= (total << jump[1]) | (first << jump[2])
+        if total == 0:
+            removing.append((child, peg_count-1))
+        else:
+            keeping.append((child, peg_count))
+
+    return removing + keeping
+
+# the following function searches for a win from the given "start" position, one level of moves at a time
+# the winning path it returns is as short as possible
+def search_bfs(table, start, lookup=None, stats=None):
+    peg_count = count_pegs(table, start)
+    if peg_count == 0:
+        raise Exception("All vertices contain a zero peg value.")
+    if peg_count == 1:
+        record(stats, 0, 0, 0, 1, 0)
+        return [start], {start: None}
+
+    parents = {start: None}
+    level = [(start, peg_count)]
+    expanded = 0
+    moves = 0
+    depth = 0
+    frontier = 1
+
+    while len(level) > 0:
+        next_level = []
+        depth += 1
+        for current_position, current_count in level:
+            filtered_positions = []
+            expanded += 1
+            children = expand(table, current_position, current_count)
+            moves += len(children)
+            for position, count in children:
+                if position in parents:
+                    continue
+                parents[position] = current_position
+                if count == 1:
+                    record(stats, expanded, moves, moves - len(parents) + 1, frontier, depth)
+                    return follow_parents(parents, position), parents
+                filtered_positions.append((position, count))
+
+            if lookup is not None and len(filtered_positions) > 0:
+                known = lookup([position for position, count in filtered_positions])
+                for position, count in filtered_positions:
+                    if position in known and known[position][0]:
+                        record(stats, expanded, moves, moves - len(parents) + 1, frontier, depth)
+                        return follow_parents(parents, position) + known[position][1], parents
+                filtered_positions = [(position, count) for position, count in filtered_positions if position not in known]
+
+            next_level.extend(filtered_positions)
+        level = next_level
+        frontier = max(frontier, len(level))
+
+    record(stats, expanded, moves, moves - len(parents) + 1, frontier, depth - 1)
+    return [], parents
+
+# the following function searches for a win from the given "start" position, going as deep as possible first
+# it plays the moves that remove a peg first, and it stops as soon as it finds a winning position
+# every position seen is remembered: a position seen again either cannot reach a win, or is already on the way to one
+# the 'frontier' of the stats is the number of positions found, but not yet played, on the current path
+def search_dfs(table, start, lookup=None, stats=None):
+    peg_count = count_pegs(table, start)
+    if peg_count == 0:
+        raise Exception("All vertices contain a zero peg value.")
+    if peg_count == 1:
+        record(stats, 0, 0, 0, 1, 0)
+        return [start], {start}
+
+    seen = {start}
+
+    # the path holds the positions from the start to the current position
+    # and every position of the path has the list of its next positions, and the index of the next one to play
+    path = [start]
+    frames = [[expand(table, start, peg_count), 0]]
+    expanded = 1
+    moves = len(frames[0][0])
+    duplicates = 0
+    pending = frontier = moves
+    depth = 0
+
+    while len(frames) > 0:
+        frame = frames[-1]
+        if frame[1] == 0 and lookup is not None:
+            known = lookup([position for position, count in frame[0] if position not in seen])
+            for position, count in frame[0]:
+                if position in known and known[position][0]:
+                    record(stats, expanded, moves, duplicates, frontier, max(depth, len(path)))
+                    return path + [position] + known[position][1], seen
+            seen.update(known)
+
+        children = frame[0]
+        while frame[1] < len(children):
+            position, count = children[frame[1]]
+            frame[1] += 1
+            pending -= 1
+            if position in seen:
+                duplicates += 1
+                continue
+
+            seen.add(position)
+            if count == 1:
+                record(stats, expanded, moves, duplicates, frontier, max(depth, len(path)))
+                return path + [position], seen
+
+            path.append(position)
+            frames.append([expand(table, position, count), 0])
+            expanded += 1
+            moves += len(frames[-1][0])
+            pending += len(frames[-1][0])
+            frontier = max(frontier, pending)
+            depth = max(depth, len(path) - 1)
+            break
+        else:
+            path.pop()
+            frames.pop()
+
+    record(stats, expanded, moves, duplicates, frontier, depth)
+    return [], seen
+
+# the following function searches for a win from the given "start" position, and back from every winning position at the same time
+# every step plays a whole level of moves on the side with the fewer positions to play: forward with the moves, backward with undo_moves
+# the search stops when the two sides meet, and the winning path is joined at the meeting position
+# the backward side never keeps positions with more pegs than the start, as a move never adds a peg
+# it returns the winning path (or an empty list), and every position seen from the start
+# the stats count the positions of both sides, and the 'depth' is the number of levels played on both sides
+# if a "prune" function is given, then a position found backward (a win included) for which it returns True is never played back (see find_path)
+def search_bidirectional(table, start, lookup=None, stats=None, prune=None):
+    peg_count = count_pegs(table, start)
+    if peg_count == 0:
+        raise Exception("All vertices contain a zero peg value.")
+    if peg_count == 1:
+        record(stats, 0, 0, 0, 1, 0)
+        return [start], {start: None}
+
+    # the forward side keeps the position each position came from, the backward side keeps the position each position leads to
+    parents = {start: None}
+    forward = [start]
+    children = {}
+    backward = []
+    for i in range(len(table['vertices'])):
+        for color in range(1, table['n']):
+            position = color << (i*table['bits'])
+            children[position] = None
+            if prune is None or not prune(position):
+                backward.append(position)
+
+    expanded = 0
+    moves = 0
+    duplicates = 0
+    depth = 0
+    frontier = 1 + len(backward)
+
+    # follow the path from the start to the meeting "position", then the path from it to a win
+    def join(position):
+        record(stats, expanded, moves, duplicates, frontier, depth)
+        path = follow_parents(parents, position)
+        position = children[position]
+        while position is not None:
+            path.append(position)
+            position = children[position]
+        return path
+
+    while len(forward) > 0 and len(backward) > 0:
+        depth += 1
+        if len(forward) <= len(backward):
+            next_forward = []
+            for current_position in forward:
+                filtered_positions = []
+                expanded += 1
+                possible_moves = build_moves(table, current_position)
+                moves += len(possible_moves)
+                for move in possible_moves:
+                    position = execute_move(table, current_position, move)
+                    if position in parents:
+                        duplicates += 1
+                        continue
+                    parents[position] = current_position
+                    if position in children:
+                        return join(position), parents
+                    filtered_positions.append(position)
+
+                if lookup is not None and len(filtered_positions) > 0:
+                    known = lookup(filtered_positions)
+                    for position in filtered_positions:
+                        if position in known and known[position][0]:
+                            record(stats, expanded, moves, duplicates, frontier, depth)
+                            return follow_parents(parents, position) + known[position][1], parents
+                    filtered_positions = [position for position in filtered_positions if position not in known]
+
+                next_forward.extend(filtered_positions)
+            forward = next_forward
+        else:
+            next_backward = []
+            for current_position in backward:
+                expanded += 1
+                previous_positions = undo_moves(table, current_position)
+                moves += len(previous_positions)
+                for position in previous_positions:
+                    if position in children:
+                        duplicates += 1
+                        continue
+                    if count_pegs(table, position) > peg_count:
+                        continue
+                    # a pruned position is kept, so it is not checked again, but it is never met from the start
+                    children[position] = current_position
+                    if prune is not None and prune(position):
+                        continue
+                    if position in parents:
+                        return join(position), parents
+                    next_backward.append(position)
+            backward = next_backward
+        frontier = max(frontier, len(forward) + len(backward))
+
+    record(stats, expanded, moves, duplicates, frontier, depth)
+    return [], parents
+
+# the search strategies: the order of game.is_winnable, breadth-first (shortest sequence), depth-first (fastest result), bidirectional,
+# and the order of game.is_winnable with the moves of every position found from the moves of the position it came from
+searches = {'default': search, 'bfs': search_bfs, 'dfs': search_dfs, 'bidirectional': search_bidirectional, 'incremental': search_incremental}
+
+# the following function counts the lookups of a transposition table "cache" (see transposition.py) found in it ('hits') and not ('misses')
+# without the counts "before" a game, it returns the counts so far (or None if the cache is not a transposition table)
+# with them, it sets the counts of the game in the "into" dictionary
+def count_transpositions(cache, before=None, into=None):
+    if not isinstance(cache, TranspositionTable):
+        return None
+    if before is None:
+        return cache.hits, cache.misses
+    into['hits'] = cache.hits - before[0]
+    into['misses'] = cache.misses - before[1]
+
+# the following function searches for a win from a "Graph" with "Configuration", with the given strategy (see searches)
+# it returns the winning path of positions (or an empty list), and every position seen
+# if a "cache" (see cache.py) is given, then the known results are used, and the results found are added to it
+# if a "stats" dictionary is given, then it is filled with the same counts as game.search,
+# where the 'time' has the phases: 'search', 'cache' (looking up and storing results), and 'unpack' (making the 'sequence', see is_winnable)
+# with a transposition table (see transposition.py) as the "cache", the stats also have the positions of the game found in it ('hits') and not ('misses')
+# if a "prune" function is given, then it is called with the start position, and returns the function that checks every position found (see pruning.check_from)
+# a position that a rule rejects is not played: forward, it is not winnable, and backward (see search_bidirectional), it is not met
+# the positions rejected by every rule are counted in the "pruned" dictionary (if any), which is also the 'pruned' of the stats
+def find_path(Graph, Configuration, table, cache=None, strategy='default', stats=None, prune=None, pruned=None):
+    if stats is not None:
+        times = {'search': 0.0, 'cache': 0.0, 'unpack': 0.0}
+        stats.update({'expanded': 0, 'moves': 0, 'duplicates': 0, 'frontier': 1, 'depth': 0, 'seen': 1, 'time': times})
+        t0 = time.perf_counter()
+        counted = count_transpositions(cache)
+
+    start = pack(table, Configuration)
+    if prune is not None:
+        check_position = prune(start)
+        if pruned is None:
+            pruned = {}
+        if stats is not None:
+            stats['pruned'] = pruned
+
+        # count the positions rejected by every rule
+        def rejected(position):
+            rule = check_position(position)
+            if rule is None:
+                return False
+            pruned[rule] = pruned.get(rule, 0) + 1
+            return True
+
+        if rejected(start):
+            if stats is not None:
+                times['search'] = time.perf_counter() - t0
+                count_transpositions(cache, counted, stats)
+            return [], [start]
+
+    if cache is None:
+        lookup = None
+    else:
+        graphFingerprint = cache_fingerprint(Graph)
+
+        # time the lookups apart from the search
+        def lookup(positions):
+            if stats is None:
+                return cache.lookup(graphFingerprint, table['n'], positions)
+            t = time.perf_counter()
+            known = cache.lookup(graphFingerprint, table['n'], positions)
+            times['cache'] += time.perf_counter() - t
+            return known
+
+        known = lookup([start])
+        if start in known:
+            winnable, line = known[start]
+            cache.flush()
+            if stats is not None:
+                times['cache'] = time.perf_counter() - t0
+                count_transpositions(cache, counted, stats)
+            return [start] + line if winnable else [], [start]
+
+    # the positions rejected by a rule are known to be not winnable, without looking them up
+    if prune is not None:
+        find_known = lookup
+        def lookup(positions):
+            known = {position: (False, []) for position in positions if rejected(position)}
+            if find_known is not None and len(known) < len(positions):
+                known.update(find_known([position for position in positions if position not in known]))
+            return known
+
+    if stats is not None:
+        t1 = time.perf_counter()
+        looking = times['cache']
+    if prune is not None and strategy == 'bidirectional':
+        path, seen_positions = search_bidirectional(table, start, lookup, stats, rejected)
+    else:
+        path, seen_positions = searches[strategy](table, start, lookup, stats)
+    if stats is not None:
+        t2 = time.perf_counter()
+        times['search'] = t2 - t1 - (times['cache'] - looking)
+        stats['seen'] = len(seen_positions)
+
+    # every position seen is not winnable if the search found no win, and every position of a winning path is winnable
+    if cache is not None:
+        if len(path) == 0:
+            cache.store(graphFingerprint, table['n'], {position: (False, []) for position in seen_positions})
+        else:
+            cache.store(graphFingerprint, table['n'], {position: (True, path[i+1:]) for i, position in enumerate(path)})
+        if stats is not None:
+            times['cache'] += time.perf_counter() - t2
+    if stats is not None:
+        count_transpositions(cache, counted, stats)
+
+    return path, seen_positions
+
+# the following function unpacks the winning "path" into the 'sequence' of configurations, and times it in the "stats" (if any)
+def unpack_path(table, path, stats=None):
+    if stats is not None:
+        t0 = time.perf_counter()
+    sequence = [unpack(table, position) for position in path]
+    if stats is not None:
+        stats['time']['unpack'] = time.perf_counter() - t0
+
+    return sequence
+
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves
+# it returns the same result as game.is_winnable, the 'seen' configurations are unpacked only when they are read
+# with the 'default' strategy, it also returns the same 'sequence' and 'seen' list
+# the "table" can be given to avoid building it again for every game on the same graph
+# a result found in the "cache" does not give the same 'sequence' and 'seen' list as playing the game
+# the "cache", "stats", and "prune" function are used as in find_path
+def is_winnable(Graph, Configuration, table=None, cache=None, strategy='default', stats=None, prune=None):
+    if table is None:
+        table = build_table(Graph, game.n)
+
+    path, seen_positions = find_path(Graph, Configuration, table, cache, strategy, stats, prune)
+    seen = UnpackedPositions(table, list(seen_positions))
+
+    if len(path) > 0:
+        return True, unpack_path(table, path, stats), seen
+    else:
+        return False, [], seen
+
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves, like game.solve
+# it returns the boolean value and the 'sequence' only: the positions seen are let go as soon as the search ends
+# if "sequence" is False, then the 'sequence' is not unpacked either, and None is returned in its place
+# the "table", "cache", "strategy", and "stats" are used as in is_winnable, and the "counts" as in game.solve
+# with a transposition table as the "cache", the "counts" also have the 'hits' and 'misses' of the game, as the stats of find_path
+# with a "prune" function, the "counts" also have the positions rejected by every rule ('pruned'), as the stats of find_path
+def solve(Graph, Configuration, table=None, cache=None, strategy='default', sequence=True, stats=None, counts=None, prune=None):
+    if table is None:
+        table = build_table(Graph, game.n)
+
+    counted = count_transpositions(cache) if counts is not None else None
+    pruned = {} if counts is not None and prune is not None else None
+    path, seen_positions = find_path(Graph, Configuration, table, cache, strategy, stats, prune, pruned)
+    if counts is not None:
+        counts['seen'] = len(seen_positions)
+        if pruned is not None:
+            counts['pruned'] = pruned
+        if counted is not None:
+            count_transpositions(cache, counted, counts)
+    del seen_positions
+
+    if not sequence:
+        return len(path) > 0, None
+    return len(path) > 0, unpack_path(table, path, stats)
+
+# the following function determines whether a "Graph" has a winning 'sequence' of moves for every one of the given "Configurations", like solve
+# it yields the boolean value and the 'sequence' of every configuration, in order, as it is played
+# the results of the positions of every game are kept in a "transposition" table (see transposition.py) for the games after it,
+# which often finish in a few lookups, as games that follow one another differ in only a few vertices
+# the table (or a new one, with at most "max_entries" positions) is kept for the whole batch, and can be given to keep it across batches
+# the "table" and "strategy" are used as in is_winnable
+def is_winnable_many(Graph, Configurations, table=None, strategy='default', transposition=None, max_entries=1000000):
+    if table is None:
+        table = build_table(Graph, game.n)
+    if transposition is None:
+        transposition = TranspositionTable(max_entries)
+
+    for Configuration in Configurations:
+        path, seen_positions = find_path(Graph, Configuration, table, transposition, strategy)
+        del seen_positions
+        yield len(path) > 0, unpack_path(table, path)
@@ -0,0 +1,155 @@
+# name: progress
+# description: Python Script that reports the progress, speed, and time left of a sweep while it plays, and writes them to a metrics file
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# a report is a single line, e.g.,
+#   Progress: 42.10% (2156/5120 games) | 812.4 games/s | 1.52e+05 states/s | Elapsed: 0:00:03 | ETA: 0:00:04
+# the games per second and states per second are found over the time since the last report (the speed right now)
+# the time left is found from the average speed of the run, so a slow section does not throw it off by much
+# the states are the positions seen by every game, so they are only known when the engine counts them (see game.solve and packed.solve)
+# with --transposition, the report also has the part of the lookups of the transposition table that found their position (the hits)
+#
+# the metrics file is in the text format of Prometheus, so the textfile collector of a node exporter can read it, e.g.,
+#   pegsolitaire_games_played_total{sweep="ps-p(5)-z(3)-r[1-80]"} 42
+# it is written to a temporary file first and then renamed, so it is never read half written
+
+import os
+import sys
+import time
+
+# the metrics of the file, with their type and help text
+metrics = [
+    ('games_played_total', 'counter', "the number of games of the range that are played"),
+    ('games_won_total', 'counter', "the number of games played that are won"),
+    ('games_lost_total', 'counter', "the number of games played that are lost"),
+    ('states_total', 'counter', "the number of positions seen by the games played in this run"),
+    ('games_in_range', 'gauge', "the number of games of the range"),
+    ('progress_ratio', 'gauge', "the part of the games of the range that are played, from 0 to 1"),
+    ('games_per_second', 'gauge', "the number of games played per second, since the last report"),
+    ('states_per_second', 'gauge', "the number of positions seen per second, since the last report"),
+    ('transposition_hits_total', 'counter', "the number of positions found in the transposition table by the games played in this run"),
+    ('transposition_misses_total', 'counter', "the number of positions not found in the transposition table by the games played in this run"),
+    ('elapsed_seconds', 'gauge', "the time spent playing the sweep, with earlier runs"),
+    ('eta_seconds', 'gauge', "the time left to play the rest of the range, at the average speed of this run"),
+    ('section', 'gauge', "the configuration section being played"),
+    ('finished', 'gauge', "1 once every game of the range is played, 0 before"),
+]
+
+# the following function formats a number of "seconds" as hours, minutes, and seconds
+def formatDuration(seconds):
+    seconds = int(seconds)
+    return "{}:{:02d}:{:02d}".format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+# the following class keeps the counts of a sweep of the games from "first" to "last", and reports them every "interval" seconds
+# the games before "gameIndex" (when a sweep is resumed) are counted as played, with the "won" and "lost" games and the time spent ("elapsed") of earlier runs
+# a report is printed (to standard error, so the output of the sweep is not changed) if "printing" is True,
+# and written to the metrics file at "metricsPath" (if any) with the given "name" as the sweep label
+class ProgressReporter:
+    def __init__(self, first, last, interval, name, metricsPath=None, printing=True, gameIndex=None, won=0, lost=0, elapsed=0):
+        self.total = last - first + 1
+        self.done = (gameIndex if gameIndex is not None else first) - first
+        self.interval = interval
+        self.name = name
+        self.metricsPath = metricsPath
+        self.printing = printing
+        self.elapsed = elapsed
+        self.won = won
+        self.lost = lost
+        self.states = 0
+        self.hits = 0
+        self.misses = 0
+        self.section = 0
+        self.finished = False
+
+        # the counts at the start of this run, and at the last report
+        self.startTime = time.time()
+        self.startDone = self.done
+        self.lastTime = self.startTime
+        self.lastDone = self.done
+        self.lastStates = 0
+
+    # the following function counts a played game, with its "result" and statistics (if any), and reports if it is time to
+    def update(self, result, stats=None):
+        self.done += 1
+        if result == True:
+            self.won += 1
+        else:
+            self.lost += 1
+        if stats is not None:
+            self.states += stats.get('seen', 0)
+            self.hits += stats.get('hits', 0)
+            self.misses += stats.get('misses', 0)
+
+        if time.time() - self.lastTime >= self.interval:
+            self.report()
+
+    # the following function sets the configuration section being played
+    def startSection(self, section):
+        self.section = section
+
+    # the following function finds the values of the metrics, as of now
+    def values(self):
+        now = time.time()
+        window = max(now - self.lastTime, 1e-9)
+        run = max(now - self.startTime, 1e-9)
+        averageRate = (self.done - self.startDone) / run
+        remaining = self.total - self.done
+
+        return {
+            'games_played_total': self.done,
+            'games_won_total': self.won,
+            'games_lost_total': self.lost,
+            'states_total': self.states,
+            'games_in_range': self.total,
+            'progress_ratio': self.done / self.total,
+            'games_per_second': (self.done - self.lastDone) / window,
+            'states_per_second': (self.states - self.lastStates) / window,
+            'transposition_hits_total': self.hits,
+            'transposition_misses_total': self.misses,
+            'elapsed_seconds': self.elapsed + run,
+            'eta_seconds': remaining / averageRate if averageRate > 0 else -1,
+            'section': self.section,
+            'finished': 1 if self.finished else 0,
+        }
+
+    # the following function prints the report line and writes the metrics file, then starts a new window of time
+    def report(self):
+        values = self.values()
+        if self.printing:
+            line = "Progress: {:.2f}% ({}/{} games) | {:.1f} games/s".format(100 * values['progress_ratio'], values['games_played_total'], values['games_in_range'], values['games_per_second'])
+            if self.states > 0:
+                line += " | {:.3g} states/s".format(values['states_per_second'])
+            if self.hits + self.misses > 0:
+                line += " | {:.1f}% hits".format(100 * self.hits / (self.hits + self.misses))
+            line += " | Elapsed: {}".format(formatDuration(values['elapsed_seconds']))
+            if not self.finished:
+                line += " | ETA: {}".format(formatDuration(values['eta_seconds']) if values['eta_seconds'] >= 0 else "--")
+            print(line, file=sys.stderr, flush=True)
+        if self.metricsPath is not None:
+            writeMetrics(self.metricsPath, self.name, values)
+
+        self.lastTime = time.time()
+        self.lastDone = self.done
+        self.lastStates = self.states
+
+    # the following function reports once more, when every game of the range is played
+    # it returns the average number of games played per second in this run
+    def finish(self):
+        self.finished = True
+        self.report()
+        return (self.done - self.startDone) / max(time.time() - self.startTime, 1e-9)
+
+# the following function writes the "values" of the metrics of the sweep with the given "name" to the file at "path", in the text format of Prometheus
+def writeMetrics(path, name, values):
+    label = name.replace('\\', '\\\\').replace('"', '\\"')
+    lines = []
+    for metric, kind, text in metrics:
+        lines.append("# HELP pegsolitaire_{} {}".format(metric, text))
+        lines.append("# TYPE pegsolitaire_{} {}".format(metric, kind))
+        lines.append("pegsolitaire_{}{{sweep=\"{}\"}} {}".format(metric, label, repr(float(values[metric])) if isinstance(values[metric], float) else values[metric]))
+
+    temporaryPath = path + '.tmp'
+    with open(temporaryPath, 'w') as metricsFile:
+        metricsFile.write("\n".join(lines) + "\n")
+    os.replace(temporaryPath, path)
@@ -0,0 +1,259 @@
+# name: pruning
+# description: Python Script that finds the positions that can never be won, without playing them
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# every rule here is proven from the move rule of game.execute_move, where a move (from, over, to) turns the pegs (a, b, 0) into (0, (a + b) % n, a)
+#
+# weights (the 'invariant' rule): give every vertex v a weight w_v, where w_from = w_over + w_to (mod p) for every jump and a prime p that divides n
+# a move changes the weighted sum of the pegs by a*(w_over + w_to - w_from) = 0 (mod p), and (a + b) % n = a + b (mod p)
+# so the weighted sum never changes, and a position can only be won if some single peg has the same weighted sum
+#
+# components (the 'components' rule): a peg only ever moves along an edge, so it never leaves the connected component of the graph it is in
+# a move always leaves a peg on the 'to' vertex, so a component with a peg always keeps one
+# so a position with pegs in two components of the graph can never be won
+#
+# classes (the 'classes' rule): join the 'from' and 'to' vertices of every jump into classes, a peg that jumps never leaves its class
+# the number of pegs in a class only goes down when a peg of the class is jumped over (and becomes a zero)
+# so the pegs of a class whose vertices are never jumped over (a 'fixed' class) stay forever,
+# and a position with two pegs in fixed classes can never be won
+#
+# so every rule keeps a value of a position that no move changes (its 'signature', see find_signature):
+# the weighted sums, the components with a peg, and the number of pegs in every fixed class
+# a position is only on a way from a "start" position to a win if it has the signature of the start, which is what the packed engine checks
+# at every position it finds (see check_from): a position found forward from a start always has it,
+# but most of the positions found back from the wins (see packed.search_bidirectional) do not, and are never played
+
+import packed
+
+# the following function finds the primes that divide n
+def prime_factors(n):
+    primes = []
+    p = 2
+    while p*p <= n:
+        if n % p == 0:
+            primes.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        primes.append(n)
+
+    return primes
+
+# the following function solves w_from - w_over - w_to = 0 (mod p) for every jump of the "table", by gaussian elimination
+# it returns a basis of the weights that solve every equation, as lists of weights in vertex order
+def find_weights(table, p):
+    size = len(table['vertices'])
+    bits = table['bits']
+
+    # every equation is a row of coefficients, one per vertex
+    rows = set()
+    for jump in table['jumps']:
+        row = [0] * size
+        row[jump[0] // bits] += 1
+        row[jump[1] // bits] -= 1
+        row[jump[2] // bits] -= 1
+        rows.add(tuple(c % p for c in row))
+    rows = [list(row) for row in rows]
+
+    # reduce the rows, every pivot column has a single 1
+    pivots = []
+    for column in range(size):
+        pivot = next((r for r in range(len(pivots), len(rows)) if rows[r][column] != 0), None)
+        if pivot is None:
+            continue
+        rows[len(pivots)], rows[pivot] = rows[pivot], rows[len(pivots)]
+        row = rows[len(pivots)]
+        inverse = pow(row[column], p-2, p)
+        row[:] = [(c * inverse) % p for c in row]
+        for other in rows:
+            if other is not row and other[column] != 0:
+                factor = other[column]
+                other[:] = [(c - factor * d) % p for c, d in zip(other, row)]
+        pivots.append(column)
+
+    # every column without a pivot is free, and gives a weight of the basis
+    weights = []
+    for free in range(size):
+        if free in pivots:
+            continue
+        weight = [0] * size
+        weight[free] = 1
+        for row, column in zip(rows, pivots):
+            weight[column] = (-row[free]) % p
+        weights.append(weight)
+
+    return weights
+
+# the following function builds the rules used to prune the positions of a given "Graph" with n colors
+# the "table" of the graph (see packed.py) can be given to avoid building it again
+def build_pruner(Graph, n, table=None):
+    if table is None:
+        table = packed.build_table(Graph, n)
+    vertices = table['vertices']
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+
+    # the weights, with the prime they are taken mod
+    invariants = []
+    for p in prime_factors(n):
+        for weight in find_weights(table, p):
+            if any(weight):
+                invariants.append((p, weight))
+
+    # every weighted sum that a single peg can have
+    wins = set()
+    for i in range(len(vertices)):
+        for color in range(1, n):
+            wins.add(tuple((color * weight[i]) % p for p, weight in invariants))
+
+    # the components of the graph, as the lowest bit of every one of their vertices
+    components = []
+    found = set()
+    for vertex in vertices:
+        if vertex in found:
+            continue
+        component = 0
+        stack = [vertex]
+        found.add(vertex)
+        while len(stack) > 0:
+            current = stack.pop()
+            component |= 1 << (index[current]*table['bits'])
+            for connected_vertex in Graph[current]:
+                if connected_vertex not in found:
+                    found.add(connected_vertex)
+                    stack.append(connected_vertex)
+        components.append(component)
+
+    # the classes of vertices joined by the jumps, as the lowest bit of every one of their vertices
+    # only the fixed classes are kept
+    bits = table['bits']
+    classes = {i: i for i in range(len(vertices))}
+    def find(i):
+        while classes[i] != i:
+            classes[i] = classes[classes[i]]
+            i = classes[i]
+        return i
+    jumped = set()
+    for jump in table['jumps']:
+        classes[find(jump[0] // bits)] = find(jump[2] // bits)
+        jumped.add(jump[1] // bits)
+    fixed = {}
+    for i in range(len(vertices)):
+        fixed[find(i)] = fixed.get(find(i), 0) | (1 << (i*bits))
+    for i in jumped:
+        fixed.pop(find(i), None)
+
+    return {'table': table, 'invariants': invariants, 'wins': wins, 'components': components, 'fixed': list(fixed.values())}
+
+# the following function finds the signature of the given "position": the value of every rule, in the order of the rules
+# these are the weighted sums of the pegs, the components of the graph with a peg, and the number of pegs in every fixed class
+def find_signature(pruner, position):
+    table = pruner['table']
+    mask = table['mask']
+    bits = table['bits']
+
+    # fold the bits of every vertex into its lowest bit, as in packed.count_pegs
+    occupied = position
+    for shift in range(1, bits):
+        occupied |= position >> shift
+    occupied &= table['low']
+
+    invariant = tuple(sum(w * ((position >> (i*bits)) & mask) for i, w in enumerate(weight) if w != 0) % p for p, weight in pruner['invariants'])
+    components = tuple(occupied & component != 0 for component in pruner['components'])
+    classes = tuple(bin(occupied & fixed).count('1') for fixed in pruner['fixed'])
+
+    return invariant, components, classes
+
+# the following function finds the rule that proves the given "position" can never be won
+# it returns the name of the rule ('invariant', 'components', or 'classes'), or None if no rule applies
+def check(pruner, position):
+    invariant, components, classes = find_signature(pruner, position)
+    if invariant not in pruner['wins']:
+        return 'invariant'
+    if sum(components) > 1:
+        return 'components'
+    if sum(classes) > 1:
+        return 'classes'
+
+    return None
+
+# the following function returns a function that finds the rule that proves a position is not on any way from the given "start" position to a win
+# that is, the rule that proves the start can never be won, or the first rule whose value differs from the value of the start (see find_signature)
+# it returns the name of the rule, or None if no rule applies
+# the packed engine checks every position it finds with it (see packed.find_path), so only the values that can differ are found
+def check_from(pruner, start):
+    rule = check(pruner, start)
+    if rule is not None:
+        return lambda position: rule
+
+    table = pruner['table']
+    mask = table['mask']
+    low = table['low']
+    shifts = range(1, table['bits'])
+    invariant, components, classes = find_signature(pruner, start)
+
+    # the weights of the vertices with a weight, at the shift of their vertex
+    sums = []
+    for (p, weight), value in zip(pruner['invariants'], invariant):
+        sums.append((p, [(i*table['bits'], w) for i, w in enumerate(weight) if w != 0], value))
+
+    # a single component always has a peg, and a class without a fixed class has nothing to count
+    occupancies = list(zip(pruner['components'], components)) if len(components) > 1 else []
+    counts = list(zip(pruner['fixed'], classes))
+
+    def check_position(position):
+        for p, weights, value in sums:
+            if sum(w * ((position >> shift) & mask) for shift, w in weights) % p != value:
+                return 'invariant'
+
+        if len(occupancies) == 0 and len(counts) == 0:
+            return None
+        occupied = position
+        for shift in shifts:
+            occupied |= position >> shift
+        occupied &= low
+        for component, value in occupancies:
+            if (occupied & component != 0) != value:
+                return 'components'
+        for fixed, value in counts:
+            if bin(occupied & fixed).count('1') != value:
+                return 'classes'
+        return None
+
+    return check_position
+
+# the names of the rules, in the order in which they are reported
+rules = ['invariant', 'components', 'classes']
+
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves
+# it returns the same result as the given "play" function (e.g., retrograde.is_winnable), with the same 'sequence' and 'seen' list,
+# but a configuration that a rule proves can never be won is not played, and only it is seen
+# if a "stats" (or "counts") dictionary is given, then it is handed to the "play" function,
+# and for a configuration that is not played, it only has the rule that lost it ('pruned', with a single position)
+def is_winnable(Graph, Configuration, pruner, play, stats=None, counts=None):
+    rule = check(pruner, packed.pack(pruner['table'], Configuration))
+    if rule is not None:
+        for counted in [stats, counts]:
+            if counted is not None:
+                counted.update({'seen': 1, 'pruned': {rule: 1}})
+        return False, [], [Configuration]
+
+    if stats is not None:
+        return play(Graph, Configuration, stats=stats)
+    if counts is not None:
+        return play(Graph, Configuration, counts=counts)
+    return play(Graph, Configuration)
+
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves, like game.solve
+# it returns the boolean value and the 'sequence' only (or None in its place, if "sequence" is False), as the given "play" function (e.g., game.solve)
+# a configuration is not played as in is_winnable
+def solve(Graph, Configuration, pruner, play, sequence=True, stats=None, counts=None):
+    rule = check(pruner, packed.pack(pruner['table'], Configuration))
+    if rule is not None:
+        for counted in [stats, counts]:
+            if counted is not None:
+                counted.update({'seen': 1, 'pruned': {rule: 1}})
+        return False, [] if sequence else None
+
+    return play(Graph, Configuration, sequence=sequence, stats=stats, counts=counts)
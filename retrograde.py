@@ -0,0 +1,67 @@
+# name: retrograde
+# description: The peg solitaire implementation that solves every position of a graph at once, working backwards from the wins
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# a position is winnable exactly when a winning position (a single peg) can be reached from it
+# so, starting from every winning position and undoing moves, every winnable position is found once, for all games on the graph
+# positions are packed as in packed.py, and every winnable position is kept with the least number of moves it needs to win
+
+import game
+import packed
+
+# the following function solves every position of a given "Graph" with n colors
+# it returns a dictionary holding the table of the graph (see packed.py) and the 'distance' dictionary,
+# which maps every winnable position to the least number of moves it needs to win
+def solve_graph(Graph, n):
+    table = packed.build_table(Graph, n)
+
+    # the winning positions: a single peg of any color on any vertex
+    level = []
+    for i in range(len(table['vertices'])):
+        for color in range(1, n):
+            level.append(color << (i*table['bits']))
+    distance = {position: 0 for position in level}
+
+    # undo one move at a time, every position found for the first time is one move further from a win
+    moves = 0
+    while len(level) > 0:
+        moves += 1
+        next_level = []
+        for position in level:
+            for previous_position in packed.undo_moves(table, position):
+                if previous_position not in distance:
+                    distance[previous_position] = moves
+                    next_level.append(previous_position)
+        level = next_level
+
+    return {'table': table, 'distance': distance}
+
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves
+# it returns the same result as game.is_winnable, where the 'sequence' has the least number of moves,
+# and the 'seen' configurations are the ones of the 'sequence' (or the configuration itself)
+# the "solved" graph can be given (see solve_graph) to avoid solving the graph again for every game
+def is_winnable(Graph, Configuration, solved=None):
+    if solved is None:
+        solved = solve_graph(Graph, game.n)
+    table = solved['table']
+    distance = solved['distance']
+
+    position = packed.pack(table, Configuration)
+    if packed.count_pegs(table, position) == 0:
+        raise Exception("All vertices contain a zero peg value.")
+
+    if position not in distance:
+        return False, [], packed.UnpackedPositions(table, [position])
+
+    # follow the moves that get one move closer to a win
+    path = [position]
+    while distance[position] > 0:
+        for move in packed.build_moves(table, position):
+            next_position = packed.execute_move(table, position, move)
+            if distance.get(next_position) == distance[position] - 1:
+                position = next_position
+                break
+        path.append(position)
+
+    return True, [packed.unpack(table, position) for position in path], packed.UnpackedPositions(table, path)
@@ -0,0 +1,425 @@
+# name: server
+# description: Python Script that keeps solvers running on localhost, to answer many small queries without starting Python every time
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# the server answers HTTP requests on localhost only, e.g.,
+# $ python3 server.py --port 8765 --workers 2
+# a query is a POST to /solve with a JSON body:
+#   {"graph": {"type": "path", "args": [5]}, "n": 3, "configurations": [[0, 1, 1, 1, 1], [1, 0, 1, 1, 1]]}
+# the graph is a family of factory.py (see families) with the arguments of its function, or the connected vertices of every vertex:
+#   {"graph": {"adjacency": {"1": [2], "2": [1, 3], "3": [2]}}, ...}
+# the games are given as configurations (peg values in sorted vertex order, whatever order the graph was built in), or as game numbers: "games": [1, 2, 3]
+# (game k is the configuration factory.gameToConfiguration(k, size, n), with its i-th peg value on the i-th vertex in sorted order)
+# "strategy" (see packed.searches) and "sequence" (false to leave out the winning moves) are optional
+# the answer has a result for every game, in order:
+#   {"results": [{"win": true, "sequence": [[0, 1, 1, 1, 1], ...]}, ...]}
+# where every configuration of a sequence is in sorted vertex order too, so the first one is the configuration of the game
+# a GET of /status returns the counts of the server
+# from Python (e.g., a notebook), use the query function:
+#   import server
+#   server.query({"type": "path", "args": [5]}, 3, games=[1, 2, 3])
+#
+# requests that arrive at the same time for the same graph, color set, and strategy are played together, in chunks handed to the worker processes
+# every worker process keeps a solver (see solver.py) for every graph and color set it has played, with its transposition table (see transposition.py),
+# so later queries on the same graph are answered from warm tables
+
+import factory
+import frozengraph
+import packed
+import solver
+import argparse
+import collections
+import http.server
+import json
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+# the graph families that a query can name, with the function of factory.py that makes them
+families = {
+    'path': factory.makePathGraph,
+    'circle': factory.makeCircleGraph,
+    'windmill': factory.makeWindmillGraph,
+    'doublestar': factory.makeDoubleStarGraph,
+    'caterpillar': factory.makeCaterpillarGraph,
+    'lollipop': factory.makeLollipopGraph,
+    'complete': factory.makeCompleteGraph,
+    'house': factory.makeHouseGraph,
+    'house-x': factory.makeHouseXGraph,
+    'grid': factory.makeGridGraph,
+    'tent': factory.makeMongolianTentGraph,
+    'petersen': factory.makeGeneralizedPetersenGraph,
+    'barbell': factory.makeBarbellGraph,
+    'gear': factory.makeGearGraph,
+    'firecracker': factory.makeFirecrackerGraph,
+    'star': factory.makeStarGraph,
+    'web': factory.makeWebGraph,
+    'tree': factory.makeTreeGraph,
+}
+
+# the largest number of graphs (or solvers, in a worker process) kept, the ones used longest ago are let go first
+maxGraphs = 64
+
+# the largest body of a request, in bytes
+maxRequestSize = 64 * 1024 * 1024
+
+# the following function makes the frozen graph of the given graph "spec" (see above)
+# a ValueError is raised if the spec is not valid, or the graph has a problem (see frozengraph.py)
+def makeGraph(spec):
+    if not isinstance(spec, dict):
+        raise ValueError("graph: expected an object with a 'type' or an 'adjacency'")
+
+    if 'adjacency' in spec:
+        adjacency = spec['adjacency']
+        if not isinstance(adjacency, dict) or len(adjacency) == 0 or any(not isinstance(adjacency[vertex], list) for vertex in adjacency):
+            raise ValueError("graph: 'adjacency' must map every vertex to the list of its connected vertices")
+        try:
+            Graph = {int(vertex): [int(v) for v in adjacency[vertex]] for vertex in adjacency}
+        except (TypeError, ValueError):
+            raise ValueError("graph: the vertices of 'adjacency' must be integers")
+        return frozengraph.freeze(Graph)
+
+    if spec.get('type') not in families:
+        raise ValueError("graph: invalid type: {} (choose from {})".format(spec.get('type'), ", ".join(families)))
+    arguments = spec.get('args', [])
+    if not isinstance(arguments, list):
+        raise ValueError("graph: 'args' must be a list")
+
+    # the roots of a tree are given as a flat list of pairs, as with the --roots argument of configuration.py
+    if spec['type'] == 'tree':
+        it = iter(arguments)
+        arguments = [dict(zip(it, it))]
+    try:
+        Graph = families[spec['type']](*arguments)
+    except (TypeError, ValueError, IndexError, KeyError) as error:
+        raise ValueError("graph: invalid arguments for {}: {}".format(spec['type'], error))
+    return frozengraph.freeze(Graph)
+
+# the following function makes the key of a graph "spec", which is the same for the same spec
+def graphKey(spec):
+    return json.dumps(spec, sort_keys=True, separators=(',', ':'))
+
+# the solvers of a worker process (see playChunk), by graph key, color set, and strategy
+workerSolvers = collections.OrderedDict()
+workerTransposition = 0
+
+# the following function sets up a worker process, with the size of the transposition table of every solver
+def initializeWorker(transposition):
+    global workerTransposition
+    workerTransposition = transposition
+
+# the following function returns the solver of the worker process for a graph "spec", n colors, and a "strategy", and makes it if needed
+# a solver of the same graph with another color set shares the moves of the graph with the new one
+def findSolver(spec, n, strategy):
+    key = (graphKey(spec), n, strategy)
+    if key in workerSolvers:
+        workerSolvers.move_to_end(key)
+        return workerSolvers[key]
+
+    sibling = next((s for (graph, colors, kind), s in workerSolvers.items() if graph == key[0] and kind == strategy), None)
+    if sibling is not None:
+        found = sibling.with_colorset(n)
+    else:
+        found = solver.Solver(makeGraph(spec), n, strategy, transposition_size=workerTransposition)
+    workerSolvers[key] = found
+    while len(workerSolvers) > maxGraphs:
+        workerSolvers.popitem(last=False)
+
+    return found
+
+# the following function plays a chunk of "configurations" (lists of peg values, in sorted vertex order) on the graph of a "spec" with n colors, in a worker process
+# it returns the result of every configuration, as in the answer of a query
+def playChunk(spec, n, strategy, sequence, configurations):
+    playing = findSolver(spec, n, strategy)
+    vertices = sorted(playing.graph)
+    results = []
+    for configuration in configurations:
+        win, moves = playing.solve(dict(zip(vertices, configuration)), sequence)
+        result = {'win': win}
+        if sequence:
+            result['sequence'] = [[c[vertex] for vertex in vertices] for c in moves]
+        results.append(result)
+
+    return results
+
+# the following class plays the games of the queries that arrive at the same time together
+# a query waits at most "wait" seconds for others, then the games of the queries with the same graph, color set, strategy, and sequence
+# are split into chunks of at most "chunkSize" games, which are played by the worker processes of the "pool" (or in this process, if there is no pool)
+# a query waits at most "timeout" seconds (if given) for its results, as a chunk is never finished if its worker process dies (e.g., it runs out of memory)
+class Batcher:
+    def __init__(self, pool, wait, chunkSize, timeout=None):
+        self.pool = pool
+        self.wait = wait
+        self.chunkSize = chunkSize
+        self.timeout = timeout
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # the following function plays the "configurations" of a single query, and waits for their results
+    # it raises the error of a worker process, if any, and a TimeoutError if the results are not found in time
+    def submit(self, spec, n, strategy, sequence, configurations):
+        job = {'group': (graphKey(spec), n, strategy, sequence), 'spec': spec, 'configurations': configurations, 'done': threading.Event(), 'results': None, 'error': None}
+        self.queue.put(job)
+        if not job['done'].wait(self.timeout):
+            raise TimeoutError("the games were not played within {} seconds".format(self.timeout))
+        if job['error'] is not None:
+            raise job['error']
+        return job['results']
+
+    def run(self):
+        while True:
+            jobs = [self.queue.get()]
+            deadline = time.monotonic() + self.wait
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    jobs.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            groups = collections.OrderedDict()
+            for job in jobs:
+                groups.setdefault(job['group'], []).append(job)
+            for group in groups.values():
+                self.play(group)
+
+    # the following function plays the games of a "group" of jobs, and hands every job its results when all the chunks are played
+    def play(self, group):
+        graph, n, strategy, sequence = group[0]['group']
+        spec = group[0]['spec']
+        configurations = [configuration for job in group for configuration in job['configurations']]
+        chunks = [configurations[begin:begin+self.chunkSize] for begin in range(0, len(configurations), self.chunkSize)]
+        results = [None] * len(chunks)
+        lock = threading.Lock()
+        pending = [len(chunks)]
+
+        def finish(error=None):
+            begin = 0
+            flat = [result for chunk in results for result in chunk] if error is None else None
+            for job in group:
+                if error is not None:
+                    job['error'] = error
+                else:
+                    job['results'] = flat[begin:begin+len(job['configurations'])]
+                    begin += len(job['configurations'])
+                job['done'].set()
+
+        def played(index, chunkResults):
+            with lock:
+                results[index] = chunkResults
+                pending[0] -= 1
+                if pending[0] == 0:
+                    finish()
+
+        def failed(error):
+            with lock:
+                if pending[0] > 0:
+                    pending[0] = 0
+                    finish(error)
+
+        if len(chunks) == 0:
+            finish()
+            return
+        for index, chunk in enumerate(chunks):
+            if self.pool is None:
+                try:
+                    played(index, playChunk(spec, n, strategy, sequence, chunk))
+                except Exception as error:
+                    failed(error)
+            else:
+                self.pool.apply_async(playChunk, (spec, n, strategy, sequence, chunk), callback=lambda chunkResults, index=index: played(index, chunkResults), error_callback=failed)
+
+# the following class answers the requests of the server (see above)
+class SolveHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def reply(self, status, body):
+        data = json.dumps(body, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != '/status':
+            self.reply(404, {'error': "not found: {}".format(self.path)})
+            return
+        with self.server.lock:
+            counts = dict(self.server.counts)
+            counts['graphs'] = len(self.server.graphs)
+        counts['uptime'] = time.time() - self.server.started
+        counts['workers'] = self.server.workers
+        self.reply(200, counts)
+
+    def do_POST(self):
+        if self.path != '/solve':
+            self.reply(404, {'error': "not found: {}".format(self.path)})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length < 0:
+                raise ValueError("Content-Length: must not be negative")
+            if length > maxRequestSize:
+                self.reply(413, {'error': "the request is larger than {} bytes".format(maxRequestSize)})
+                return
+            request = json.loads(self.rfile.read(length))
+            spec, n, strategy, sequence, configurations = self.server.readQuery(request)
+        except (ValueError, TypeError) as error:
+            self.reply(400, {'error': str(error)})
+            return
+
+        try:
+            results = self.server.batcher.submit(spec, n, strategy, sequence, configurations)
+        except TimeoutError as error:
+            self.reply(503, {'error': str(error)})
+            return
+        except Exception as error:
+            self.reply(500, {'error': "{}: {}".format(type(error).__name__, error)})
+            return
+
+        with self.server.lock:
+            self.server.counts['queries'] += 1
+            self.server.counts['games'] += len(configurations)
+        self.reply(200, {'results': results})
+
+# the following class is the server, which keeps the frozen graphs of the queries to check their games before they are played
+class SolveServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port, batcher, workers, verbose=False):
+        super().__init__(('127.0.0.1', port), SolveHandler)
+        self.batcher = batcher
+        self.workers = workers
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.graphs = collections.OrderedDict()
+        self.counts = {'queries': 0, 'games': 0}
+        self.started = time.time()
+
+    # the following function returns the frozen graph of a "spec", and makes it if needed
+    def findGraph(self, spec):
+        key = graphKey(spec)
+        with self.lock:
+            if key in self.graphs:
+                self.graphs.move_to_end(key)
+                return self.graphs[key]
+        Graph = makeGraph(spec)
+        with self.lock:
+            self.graphs[key] = Graph
+            while len(self.graphs) > maxGraphs:
+                self.graphs.popitem(last=False)
+        return Graph
+
+    # the following function reads and checks a query (see above)
+    # it returns the graph spec, n, strategy, sequence, and the configurations as lists of peg values
+    # a ValueError is raised if the query is not valid
+    def readQuery(self, request):
+        if not isinstance(request, dict):
+            raise ValueError("expected a JSON object")
+        spec = request.get('graph')
+        Graph = self.findGraph(spec)
+        size = len(Graph)
+
+        n = request.get('n', 3)
+        if not isinstance(n, int) or n < 2:
+            raise ValueError("n: must be an integer of at least 2")
+        strategy = request.get('strategy', 'default')
+        if strategy not in packed.searches:
+            raise ValueError("strategy: invalid choice: {} (choose from {})".format(strategy, ", ".join(packed.searches)))
+        sequence = request.get('sequence', True) is not False
+
+        for name in ['games', 'configurations']:
+            if not isinstance(request.get(name, []), list):
+                raise ValueError("{}: must be a list".format(name))
+
+        configurations = []
+        if 'games' in request:
+            totalGames = ((n-1) ** (size-1)) * size
+            for gameIndex in request['games']:
+                if not isinstance(gameIndex, int) or gameIndex < 1 or gameIndex > totalGames:
+                    raise ValueError("games: invalid game: {} (choose from [1, {}])".format(gameIndex, totalGames))
+                configurations.append(list(factory.gameToConfiguration(gameIndex, size, n).values()))
+        for configuration in request.get('configurations', []):
+            if not isinstance(configuration, list) or len(configuration) != size or any(not isinstance(c, int) or c < 0 or c >= n for c in configuration):
+                raise ValueError("configurations: expected {} peg values from 0 to {}: {}".format(size, n-1, configuration))
+            if not any(configuration):
+                raise ValueError("configurations: every vertex has a zero peg value: {}".format(configuration))
+            configurations.append(configuration)
+
+        return spec, n, strategy, sequence, configurations
+
+# the following function asks a running server at the given "url" to play games on the graph of a "spec" with n colors
+# the games are given as "configurations" (dictionaries, or lists of peg values in sorted vertex order) or game numbers ("games")
+# it returns the list of results, as in the answer of a query
+def query(spec, n, configurations=None, games=None, strategy='default', sequence=True, url='http://127.0.0.1:8765'):
+    request = {'graph': spec, 'n': n, 'strategy': strategy, 'sequence': sequence}
+    if configurations is not None:
+        request['configurations'] = [[c[vertex] for vertex in sorted(c)] if isinstance(c, dict) else list(c) for c in configurations]
+    if games is not None:
+        request['games'] = list(games)
+
+    data = json.dumps(request).encode()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url + '/solve', data, {'Content-Type': 'application/json'})) as response:
+            return json.loads(response.read())['results']
+    except urllib.error.HTTPError as error:
+        raise ValueError(json.loads(error.read()).get('error', str(error)))
+
+# setup the argument parser
+parser = argparse.ArgumentParser()
+parser.add_argument('--port', type=int, help="the port on localhost to answer on (default: 8765)", metavar='port', default=8765)
+parser.add_argument('--workers', type=int, help="the number of processes playing games (0 plays them in the server process) (default: 1)", metavar='N', default=1)
+parser.add_argument('--chunk', type=int, help="the largest number of games handed to a worker process at a time (default: 64)", metavar='k', default=64)
+parser.add_argument('--wait', type=float, help="the number of milliseconds a query waits for others to be played with it (default: 5)", metavar='ms', default=5)
+parser.add_argument('--timeout', type=float, help="the number of seconds a query waits for its games to be played, before it is answered with an error (default: 600)", metavar='s', default=600)
+parser.add_argument('--transposition', type=int, help="the number of positions kept in the transposition table of every solver of a worker process (default: 100000)", metavar='N', default=100000)
+parser.add_argument('--verbose', action="store_true", help="print every request")
+
+if __name__ == '__main__':
+    args = parser.parse_args()
+
+    if args.workers < 0:
+        print("server.py: error: argument --workers: must be at least 0")
+        sys.exit()
+    if args.chunk < 1:
+        print("server.py: error: argument --chunk: must be at least 1")
+        sys.exit()
+    if args.timeout <= 0:
+        print("server.py: error: argument --timeout: must be more than 0")
+        sys.exit()
+
+    # the worker processes are started with the 'fork' method, as in sweep.py
+    pool = None
+    if args.workers > 0:
+        pool = multiprocessing.get_context('fork').Pool(args.workers, initializeWorker, (args.transposition,))
+    else:
+        initializeWorker(args.transposition)
+
+    batcher = Batcher(pool, args.wait / 1000, args.chunk, args.timeout)
+    try:
+        server = SolveServer(args.port, batcher, args.workers, args.verbose)
+    except OSError as error:
+        print("server.py: error: argument --port: {}".format(error))
+        sys.exit()
+
+    print("Serving On: http://127.0.0.1:{}".format(args.port), flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
@@ -0,0 +1,366 @@
+# name: shard
+# description: Python Script that splits a sweep into shards, hands the shards out to workers through a shared directory, and merges their results files
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# a shard is one of N equal parts of the games of a sweep, played by configuration.py with '--shard k N -o jsonl'
+# the results file of a shard describes the whole sweep it is a part of (see output.py):
+#   {"sweep": {"type": "path", "size": 5, "n": 3, "range": [28, 54], "graph": "5", "shard": {"index": 2, "count": 3, "range": [1, 80]}}}
+# the shards can be played anywhere (e.g., on other machines), and then merged into a single results file (and xlsx file):
+# $ python3 configuration.py -t path -s 5 -o jsonl --shard 1 3
+# $ python3 configuration.py -t path -s 5 -o jsonl --shard 2 3
+# $ python3 configuration.py -t path -s 5 -o jsonl --shard 3 3
+# $ python3 shard.py merge ps-p(5)-z(3)-r[*].jsonl
+# or played by workers that take the shards from a shared directory (e.g., a network drive), one at a time:
+# $ python3 shard.py work sweep/ 3 -- -t path -s 5
+# a worker claims shard k with the file 'k.claim', which it touches while the shard is played, and marks it with the file 'k.done' at the end
+# a claim that has not been touched for a while belongs to a worker that stopped, and is taken over by another worker (which resumes the shard)
+
+import output
+import argparse
+import glob
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+
+# the following function finds the games [a, b] of the shard with the given "index" (from 1) of "count" shards of the games [first, last]
+def shardRange(first, last, index, count):
+    games = last - first + 1
+    return first + (index-1)*games//count, first + index*games//count - 1
+
+# the following function reads the sweep (first record) and summary (last record) of the results file at the given "path"
+# the summary is None if the file has none (i.e., the shard has not finished, or was stopped while writing it)
+# only the ends of the file are read, so the games of a large file are not read
+def readEnds(path):
+    sweep = None
+    summary = None
+    with open(path, 'rb') as file:
+        first = file.readline()
+        if first.endswith(b'\n') and first.strip():
+            sweep = json.loads(first).get('sweep')
+
+        # read back from the end of the file until the start of the last line
+        end = file.seek(0, os.SEEK_END)
+        start = end
+        last = b''
+        while start > 0 and last.count(b'\n') < 2:
+            start = max(0, start - 4096)
+            file.seek(start)
+            last = file.read(end - start)
+        if last.endswith(b'\n'):
+            last = last.rstrip(b'\n').rsplit(b'\n', 1)[-1]
+        else:
+            last = b''
+        if last.startswith(b'{"summary"'):
+            summary = json.loads(last)['summary']
+
+    return sweep, summary
+
+# the following function lists the ranges of consecutive games, e.g., [1, 2, 3, 7] as "[1-3], [7-7]"
+def describeRanges(ranges):
+    return ", ".join("[{}-{}]".format(a, b) for a, b in ranges)
+
+# the following function adds the game "gameIndex" to the "ranges", joining it with the last range if they are consecutive
+def addToRanges(ranges, gameIndex):
+    if len(ranges) > 0 and ranges[-1][1] == gameIndex-1:
+        ranges[-1][1] = gameIndex
+    else:
+        ranges.append([gameIndex, gameIndex])
+
+# the following function merges the results files of the shards at the given "paths" into the results file at "mergedPath"
+# the games are written in order, a game found in more than one file is written once, and the missing games are skipped
+# (as are the games of a partial last line, left by a shard that was stopped in the middle of a write)
+# it returns a report of the merge: the games played, won, and lost, the missing and duplicate ranges, and the files of unfinished shards
+# a ValueError is raised if a file is not a results file, or the files are not of the same sweep
+def mergeShards(paths, mergedPath):
+    shards = []
+    for path in paths:
+        sweep, summary = readEnds(path)
+        if sweep is None:
+            raise ValueError("not a results file: {}".format(path))
+        shards.append((sweep, summary, path))
+
+    # every shard must be a part of the same sweep: the header of every file (but its range and shard index) is the same,
+    # including the graph (e.g., the shape of a caterpillar or tree), so the merged header (see below) holds for every game that is merged
+    first = shards[0][0]
+    for sweep, summary, path in shards:
+        keys = (set(sweep) | set(first)) - {'range', 'shard'}
+        if any(sweep.get(key) != first.get(key) for key in keys) or \
+           any(sweep.get('shard', {}).get(key) != first.get('shard', {}).get(key) for key in ['count', 'range']):
+            raise ValueError("the shards are not of the same sweep: {} and {}".format(shards[0][2], path))
+
+    # the whole range of the sweep, or the range covered by the files if they are not shards
+    if 'shard' in first:
+        a, b = first['shard']['range']
+    else:
+        a = min(sweep['range'][0] for sweep, summary, path in shards)
+        b = max(sweep['range'][1] for sweep, summary, path in shards)
+    shards.sort(key=lambda shard: shard[0]['range'][0])
+
+    sweep = {key: first[key] for key in first if key not in ['range', 'shard']}
+    sweep['range'] = [a, b]
+    resultWriter = output.ResultWriter(mergedPath, sweep)
+
+    # the games of the files are in order, and the files are sorted by their first game, so every game is written in order
+    missing = []
+    duplicates = []
+    wonGames = 0
+    lostGames = 0
+    nextGame = a
+    for shard in shards:
+        for record in output.readRecords(shard[2]):
+            if 'game' not in record:
+                continue
+            if record['game'] < nextGame:
+                addToRanges(duplicates, record['game'])
+                continue
+            if record['game'] > nextGame:
+                missing.append([nextGame, record['game']-1])
+
+            resultWriter.writeLine(record)
+            if record['win']:
+                wonGames += 1
+            else:
+                lostGames += 1
+            nextGame = record['game'] + 1
+    if nextGame <= b:
+        missing.append([nextGame, b])
+
+    # the statistics of the shards are added up, in the same columns as configuration.py writes them
+    # the time is the time spent by all the shards
+    summaries = [shardSummary for shardSweep, shardSummary, path in shards if shardSummary is not None]
+    summary = output.SummarySheet()
+    names = list(summaries[0]) if len(summaries) > 0 else []
+    values = {'Played': wonGames + lostGames, 'Won': wonGames, 'Lost': lostGames}
+    seconds = sum(float(s.get("Time (s)", 0)) for s in summaries)
+    values.update({"Time (h)": "%.3f" % (seconds / 3600), "Time (m)": "%.3f" % (seconds / 60), "Time (s)": "%.3f" % seconds})
+    for column, name in enumerate(names):
+        summary.write(0, column, name)
+        if name in values:
+            summary.write(1, column, values[name])
+        elif name.startswith("Pruned"):
+            summary.write(1, column, sum(s.get(name, 0) for s in summaries))
+        else:
+            summary.write(1, column, summaries[0][name])
+    resultWriter.writeSummary(summary)
+    resultWriter.close()
+
+    return {
+        'range': [a, b],
+        'shards': len(shards),
+        'summary': summary.values(),
+        'missing': missing,
+        'duplicates': duplicates,
+        'unfinished': [path for shardSweep, shardSummary, path in shards if shardSummary is None],
+    }
+
+# the following function makes the name of the merged file from the name of the file of a shard, with the range of the whole sweep
+def mergedName(path, a, b, extension):
+    name = os.path.basename(path)
+    return re.sub(r'\[\d+-\d+\]\.jsonl$', "[{}-{}].{}".format(a, b, extension), name)
+
+# the following function finds the results file of the shard with the given "index" of "count" shards, in the given "directory"
+# it returns the path of the file, and whether the shard has finished (i.e., its file has a summary)
+def findShard(directory, index, count):
+    for path in glob.glob(os.path.join(directory, '*.jsonl')):
+        sweep, summary = readEnds(path)
+        if sweep is not None and sweep.get('shard', {}).get('index') == index and sweep['shard']['count'] == count:
+            return path, summary is not None
+
+    return None, False
+
+# the following function claims the shard with the given "index" in the given "directory", for this worker
+# a claim is made by creating its file, which only one worker can do
+# a claim that was not touched for "stale" seconds is taken over, by a single worker: it takes the lock of the shard (a file 'k.lock',
+# which only one worker can create), checks the age of the claim again (another worker may have just taken it over), and only then renames it
+# a lock older than "stale" seconds belongs to a worker that stopped while taking over, and is removed
+# it returns 'new' or 'stale' if the shard was claimed, and None if it was not
+def claimShard(directory, index, stale):
+    claimPath = os.path.join(directory, "{}.claim".format(index))
+    worker = "{}:{}".format(socket.gethostname(), os.getpid())
+    claimed = 'new'
+
+    try:
+        age = time.time() - os.path.getmtime(claimPath)
+    except FileNotFoundError:
+        age = None
+    if age is not None:
+        if age < stale:
+            return None
+
+        lockPath = os.path.join(directory, "{}.lock".format(index))
+        try:
+            lock = os.open(lockPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lockPath) >= stale:
+                    os.remove(lockPath)
+            except FileNotFoundError:
+                pass
+            return None
+        os.close(lock)
+
+        try:
+            try:
+                age = time.time() - os.path.getmtime(claimPath)
+            except FileNotFoundError:
+                return None
+            if age < stale:
+                return None
+            os.rename(claimPath, "{}.{}".format(claimPath, worker.replace(':', '-')))
+            claimed = 'stale'
+        finally:
+            os.remove(lockPath)
+
+    try:
+        file = os.open(claimPath, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return None
+    os.write(file, worker.encode())
+    os.close(file)
+
+    return claimed
+
+# the following function plays the shards in the given "directory" (of "count" shards), until every shard is done
+# every shard is played by configuration.py with the given "arguments", in the directory
+# the claim of the shard is touched every "heartbeat" seconds while it is played
+# the shards claimed by other workers are checked again every "heartbeat" seconds, so a claim that goes stale is taken over,
+# even if its worker stops after every other worker has passed over its shard
+# a shard that failed in this worker is left to the others (once its claim goes stale), and the worker stops when only such shards are left
+def runWorker(directory, count, arguments, stale, heartbeat):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'configuration.py')
+    played = 0
+    failed = set()
+
+    while True:
+        remaining = [index for index in range(1, count+1) if not os.path.exists(os.path.join(directory, "{}.done".format(index)))]
+        if all(index in failed for index in remaining):
+            break
+
+        claimedAny = False
+        for index in remaining:
+            if index in failed or os.path.exists(os.path.join(directory, "{}.done".format(index))):
+                continue
+            claimed = claimShard(directory, index, stale)
+            if claimed is None:
+                continue
+            claimedAny = True
+
+            # a shard taken over from a stopped worker continues from its checkpoint, if it saved one
+            command = [sys.executable, script] + arguments + ['--shard', str(index), str(count), '-o', 'jsonl']
+            path, finished = findShard(directory, index, count)
+            if claimed == 'stale' and path is not None and os.path.exists(path + '.checkpoint'):
+                command.append('--resume')
+            print("Shard ({}/{}): Playing... ".format(index, count), end="", flush=True)
+
+            claimPath = os.path.join(directory, "{}.claim".format(index))
+            with open(os.path.join(directory, "{}.log".format(index)), 'w') as log:
+                process = subprocess.Popen(command, cwd=directory, stdout=log, stderr=subprocess.STDOUT)
+                while True:
+                    try:
+                        process.wait(timeout=heartbeat)
+                        break
+                    except subprocess.TimeoutExpired:
+                        os.utime(claimPath)
+
+            # configuration.py reports its errors in the log, so the shard is done only if its results file has a summary
+            path, finished = findShard(directory, index, count)
+            if not finished:
+                failed.add(index)
+                print("Failed. (see {}.log)".format(index))
+                continue
+            with open(os.path.join(directory, "{}.done".format(index)), 'w') as file:
+                file.write(os.path.basename(path))
+            played += 1
+            print("Done.")
+
+        # every shard left is being played by another worker, so wait for them to finish or go stale
+        if not claimedAny:
+            time.sleep(heartbeat)
+
+    return played
+
+# setup the argument parser
+parser = argparse.ArgumentParser()
+commands = parser.add_subparsers(dest='command', metavar='command')
+commands.required = True
+merge = commands.add_parser('merge', help="merge the results files of the shards of a sweep, and report the missing and duplicate games")
+merge.add_argument('files', type=str, nargs='+', help="the results files (or directories of results files) of the shards", metavar='file')
+merge.add_argument('-o', '--output', type=str, help="the type of file to make: xlsx, jsonl (default: xlsx)", metavar='format', choices=['xlsx', 'jsonl'], default='xlsx')
+work = commands.add_parser('work', help="play the shards of a sweep that are not claimed by another worker, in a shared directory", usage="%(prog)s [-h] [--stale s] [--heartbeat s] directory N -- arguments", epilog="the arguments of configuration.py for the sweep follow '--', e.g., '-- -t path -s 5'")
+work.add_argument('directory', type=str, help="the shared directory of the sweep, where the shards are claimed and their results files are written", metavar='directory')
+work.add_argument('count', type=int, help="the number of shards of the sweep", metavar='N')
+work.add_argument('--stale', type=int, help="the number of seconds after which the claim of a stopped worker is taken over (default: 300)", metavar='s', default=300)
+work.add_argument('--heartbeat', type=int, help="the number of seconds between touches of the claim of the shard being played (default: 30)", metavar='s', default=30)
+
+if __name__ == '__main__':
+    # the arguments of configuration.py (after '--') are handed to it as they are
+    arguments = []
+    if '--' in sys.argv:
+        arguments = sys.argv[sys.argv.index('--')+1:]
+        sys.argv = sys.argv[:sys.argv.index('--')]
+    args = parser.parse_args()
+
+    if args.command == 'work':
+        if any(argument in ['--shard', '-o', '--output', '--resume'] for argument in arguments):
+            print("shard.py: error: argument arguments: --shard, --output, and --resume are set by the worker")
+            sys.exit()
+        if args.heartbeat >= args.stale:
+            print("shard.py: error: argument --heartbeat: must be less than --stale")
+            sys.exit()
+        os.makedirs(args.directory, exist_ok=True)
+        played = runWorker(args.directory, args.count, arguments, args.stale, args.heartbeat)
+        done = sum(1 for index in range(1, args.count+1) if os.path.exists(os.path.join(args.directory, "{}.done".format(index))))
+        print("")
+        print("Played: {} shards".format(played))
+        print("Done: {} of {} shards".format(done, args.count))
+        sys.exit()
+
+    paths = []
+    for path in args.files:
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, '*.jsonl'))))
+        else:
+            paths.append(path)
+    if len(paths) == 0:
+        print("shard.py: error: argument files: no results files found")
+        sys.exit()
+
+    # find the name of the merged file before it is written, so a directory holding it can be merged again
+    resultFileName = 'merged.jsonl'
+    for path in paths:
+        sweep, summary = readEnds(path)
+        if sweep is not None and 'shard' in sweep:
+            resultFileName = mergedName(path, sweep['shard']['range'][0], sweep['shard']['range'][1], 'jsonl')
+            break
+    paths = [path for path in paths if os.path.abspath(path) != os.path.abspath(resultFileName)]
+    if len(paths) == 0:
+        print("shard.py: error: argument files: no results files found")
+        sys.exit()
+
+    try:
+        report = mergeShards(paths, resultFileName)
+    except ValueError as error:
+        print("shard.py: error: argument files: {}".format(error))
+        sys.exit()
+    fileName = resultFileName[:-len('jsonl')] + args.output
+    print("Generating File: {}".format(fileName))
+    print("")
+
+    print("Shards: {}".format(report['shards']))
+    if len(report['unfinished']) > 0:
+        print("Unfinished: {}".format(", ".join(report['unfinished'])))
+    print("Missing: {}".format(describeRanges(report['missing']) or "none"))
+    print("Duplicates: {}".format(describeRanges(report['duplicates']) or "none"))
+    print("")
+    print("Statistics:")
+    for name, value in report['summary'].items():
+        print("{}: {}".format(name, value))
+
+    if args.output == 'xlsx':
+        output.exportToXlsx(resultFileName, fileName)
+        os.remove(resultFileName)
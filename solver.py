@@ -0,0 +1,84 @@
+# name: solver
+# description: The peg solitaire implementation as an object that holds its own graph and color set, to solve games of several color sets at once
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# a solver holds a graph, its color set n, and the table of the graph (see packed.py), so it never reads or sets game.n
+# solvers of different color sets can be used side by side, e.g., in the same process:
+#   solver = Solver(factory.makePathGraph(5), 3)
+#   for n in [3, 4, 5]:
+#       result, sequence = solver.with_colorset(n).solve(factory.gameToConfiguration(1, 5, n))
+# the table of a solver is only read while playing, so a solver can be used by many threads at the same time
+# a cache file (see cache.py) is opened once in every thread that uses it, as an SQLite connection can only be used by the thread that opened it
+
+import packed
+import pruning
+import cache
+import frozengraph
+import transposition
+import functools
+import threading
+
+# the following class plays games on a given "Graph" with n colors, with the packed engine and the given strategy (see packed.searches)
+# the graph is frozen (see frozengraph.py), and a ValueError is raised if it has a problem
+# if the "cache_path" of a cache file is given, then the results of positions are kept in it (see cache.py), with at most "cache_size" positions
+# otherwise, if a "transposition_size" is given, then the results of positions are kept in memory across games (see transposition.py), with at most that many positions
+# the "jumps" of the graph (see packed.build_jumps) can be given, to share them with the solvers of the other color sets
+# if "prune" is True, then every position found is checked by the rules of pruning.py, and the positions they reject are not played
+class Solver:
+    def __init__(self, Graph, n, strategy='default', cache_path=None, cache_size=1000000, jumps=None, transposition_size=0, prune=False):
+        if n < 2:
+            raise ValueError("the color set must have at least 2 colors: {}".format(n))
+        if strategy not in packed.searches:
+            raise ValueError("unknown strategy: {} (choose from {})".format(strategy, ", ".join(packed.searches)))
+
+        self.graph = frozengraph.freeze(Graph)
+        self.n = n
+        self.strategy = strategy
+        self.cache_path = cache_path
+        self.cache_size = cache_size
+        self.transposition_size = transposition_size
+        self.jumps = jumps if jumps is not None else packed.build_jumps(Graph)
+        self.table = packed.build_table(Graph, n, self.jumps)
+        self.pruner = pruning.build_pruner(Graph, n, self.table) if prune else None
+        self.prune = functools.partial(pruning.check_from, self.pruner) if prune else None
+        self.local = threading.local()
+
+    # the following function returns a solver of the same graph (and strategy and cache) with "n" colors
+    # the jumps of the graph are shared, and only the table of the color set is built
+    def with_colorset(self, n):
+        if n == self.n:
+            return self
+        return Solver(self.graph, n, self.strategy, self.cache_path, self.cache_size, self.jumps, self.transposition_size, self.pruner is not None)
+
+    # the following function returns the cache (or transposition table) of the thread that calls it, and makes it on first use
+    # it returns None if the solver has neither
+    def cache(self):
+        if self.cache_path is None and self.transposition_size <= 0:
+            return None
+        if getattr(self.local, 'cache', None) is None:
+            if self.cache_path is not None:
+                self.local.cache = cache.SolvedCache(self.cache_path, self.cache_size)
+            else:
+                self.local.cache = transposition.TranspositionTable(self.transposition_size)
+        return self.local.cache
+
+    # the following function determines whether the graph with "Configuration" has a winning 'sequence' of moves
+    # it returns the same result as game.is_winnable with n colors (see packed.is_winnable)
+    def is_winnable(self, Configuration, stats=None):
+        return packed.is_winnable(self.graph, Configuration, self.table, self.cache(), self.strategy, stats, self.prune)
+
+    # the following function determines whether the graph with "Configuration" has a winning 'sequence' of moves, like game.solve with n colors
+    # it returns the boolean value and the 'sequence' only (or None in its place, if "sequence" is False), and sets the "counts" as game.solve
+    def solve(self, Configuration, sequence=True, stats=None, counts=None):
+        return packed.solve(self.graph, Configuration, self.table, self.cache(), self.strategy, sequence, stats, counts, self.prune)
+
+    # the following function determines whether the graph has a winning 'sequence' of moves for every one of the given "Configurations" (see packed.is_winnable_many)
+    # the results of positions are kept across the games in the cache of the solver, or in a new transposition table if it has none
+    def is_winnable_many(self, Configurations):
+        return packed.is_winnable_many(self.graph, Configurations, self.table, self.strategy, self.cache())
+
+    # the following function plays a game of the graph the same way as a "play" function of configuration.py (e.g., packed.solve), with the "Graph" ignored
+    # it lets a solver be used wherever such a function is expected
+    def __call__(self, Graph, Configuration, stats=None, counts=None):
+        return self.solve(Configuration, stats=stats, counts=counts)
@@ -0,0 +1,130 @@
+# name: sweep
+# description: Python Script that plays the games of a sweep, one after another or in a pool of worker processes
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+import game
+import factory
+import symmetry
+import collections
+import itertools
+import multiprocessing
+
+# the graph, the function that plays a game, and whether to collect the statistics of every game, set once in every worker process
+# the number of worker processes of the pool
+workerGraph = None
+workerPlay = None
+workerStats = False
+workerCount = 1
+
+# the following function sets up a worker process to play games on the given graph with n colors
+def initializeWorker(graph, n, play, collectStats=False):
+    global workerGraph, workerPlay, workerStats
+    workerGraph = graph
+    workerPlay = play
+    workerStats = collectStats
+    game.n = n
+
+# the following function plays a single configuration, and returns its result, 'sequence', and statistics
+# the statistics (see game.search) are only collected if asked for, and are None otherwise
+# if "collectStats" is 'seen', then only the number of configurations seen is counted (see game.solve), without slowing down the game
+# the play function may return the 'seen' list (e.g., game.is_winnable) or not (e.g., game.solve), it is never kept
+def playGame(play, graph, configuration, collectStats):
+    stats = {} if collectStats else None
+    if collectStats == 'seen':
+        outcome = play(graph, configuration, counts=stats)
+    elif collectStats:
+        outcome = play(graph, configuration, stats=stats)
+    else:
+        outcome = play(graph, configuration)
+
+    return outcome[0], outcome[1], stats
+
+# the following function plays a single configuration in a worker process
+def playInWorker(configuration):
+    return playGame(workerPlay, workerGraph, configuration, workerStats)
+
+# the following function makes a pool of worker processes that play games on the given graph with n colors
+# the pool uses the 'fork' start method, as configuration.py is a script that cannot be imported again by the workers
+def makePool(workers, graph, n, play, collectStats=False):
+    global workerCount
+    workerCount = workers
+    context = multiprocessing.get_context('fork')
+    return context.Pool(workers, initializeWorker, (graph, n, play, collectStats))
+
+# the following function plays a chunk of configurations in a worker process
+def playChunkInWorker(configurations):
+    return [playInWorker(configuration) for configuration in configurations]
+
+# the following function plays the given configurations on the graph
+# it yields every configuration with its result, 'sequence', and statistics (see playGame), in the same order as the configurations
+# if a pool is given, then the configurations are handed out to the workers in chunks of the given size
+# only a few chunks per worker are handed out ahead, so the configurations are made as they are needed
+def playConfigurations(configurations, graph, play, pool=None, chunkSize=1, collectStats=False):
+    if pool is None:
+        for configuration in configurations:
+            result, sequence, stats = playGame(play, graph, configuration, collectStats)
+            yield configuration, result, sequence, stats
+    else:
+        configurations = iter(configurations)
+        pending = collections.deque()
+        while True:
+            chunk = list(itertools.islice(configurations, chunkSize))
+            if len(chunk) > 0:
+                pending.append((chunk, pool.apply_async(playChunkInWorker, (chunk,))))
+            if len(pending) > 0 and (len(chunk) == 0 or len(pending) >= 4*workerCount):
+                chunk, results = pending.popleft()
+                for configuration, (result, sequence, stats) in zip(chunk, results.get()):
+                    yield configuration, result, sequence, stats
+            elif len(chunk) == 0:
+                break
+
+# the following function plays the given configurations on the graph, like playConfigurations
+# on the graph with n colors, but only a single configuration of every set of symmetric configurations (under the automorphism "generators", and the color automorphisms "colorGenerators" if given) is played:
+# the canonical configuration of the set (see symmetry.canonical_form), when the first configuration of the set comes up
+# every configuration of the set copies its result, and its 'sequence' is carried over from the canonical configuration by the automorphisms between them
+# "solved" maps the key of every canonical configuration to its result, 'sequence', and the number of configurations of its set that are still to come
+# it is kept between calls, as a set can span several sections, and a set is let go once its last configuration has come
+# if the range of game numbers of the sweep is given, then only the configurations in it are counted
+# the configurations are read in blocks, so only a block of them (and the sets still to come) is kept at a time
+# only the configurations whose set was played with them have statistics, the others have None
+def playSymmetricConfigurations(configurations, graph, n, play, generators, solved, pool=None, chunkSize=1, gameRange=None, collectStats=False, colorGenerators=None):
+    configurations = iter(configurations)
+    blockSize = max(256, 4 * workerCount * chunkSize)
+    moves = None
+    while True:
+        block = list(itertools.islice(configurations, blockSize))
+        if len(block) == 0:
+            break
+
+        # find the canonical configuration of every configuration, and the sets that are new
+        forms = []
+        playedConfigurations = []
+        for configuration in block:
+            if moves is None:
+                vertices = sorted(configuration)
+                moves = symmetry.compile_moves(vertices, generators, colorGenerators)
+            key, transform, orbit = symmetry.canonical_form(tuple(configuration[vertex] for vertex in vertices), moves, vertices, generators, colorGenerators)
+            new = key not in solved
+            if new:
+                # the configurations of the set before this one have come already, so only this one and the ones after it are counted
+                gameIndex = factory.configurationToGame(configuration, n)
+                last = gameRange[1] if gameRange is not None else len(configuration) * (n-1) ** (len(configuration)-1)
+                remaining = sum(1 for memberKey in orbit if gameIndex <= factory.configurationToGame(dict(zip(configuration, memberKey)), n) <= last)
+                solved[key] = [None, None, remaining]
+                playedConfigurations.append(dict(zip(sorted(configuration), key)))
+            forms.append((key, transform, new))
+
+        results = playConfigurations(playedConfigurations, graph, play, pool, chunkSize, collectStats)
+        for configuration, (key, (permutation, colors), new) in zip(block, forms):
+            stats = None
+            if new:
+                playedConfiguration, solved[key][0], solved[key][1], stats = next(results)
+
+            result, sequence, remaining = solved[key]
+            if remaining <= 1:
+                del solved[key]
+            else:
+                solved[key][2] = remaining-1
+
+            yield configuration, result, [symmetry.apply(permutation, c, colors) for c in sequence], stats
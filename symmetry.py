@@ -0,0 +1,211 @@
+# name: symmetry
+# description: Python Script that finds the automorphisms of a graph, to play a single game for every set of symmetric configurations
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+import math
+import operator
+
+import frozengraph
+
+# an automorphism (or permutation) is a dictionary that maps every vertex of the graph to its image
+# configurations that are images of one another under an automorphism are either all winnable or all not winnable
+# and the winning 'sequence' of one of them is turned into a winning 'sequence' of another by the same automorphism
+#
+# a color automorphism is a dictionary that maps every peg value of Z_n to its product with a unit u of Z_n (a value with gcd(u, n) = 1)
+# a move turns the pegs (a, b, 0) into (0, (a + b) % n, a), and (u*a + u*b) % n = u*(a + b) % n, so every move is a move of the multiplied pegs
+# a unit never multiplies a peg into a zero, so a single peg stays a single peg, and the same holds as for the automorphisms of the graph
+
+# the following function orders the vertices of a "Graph" so that every vertex (after the first) is connected to an earlier one, if possible
+# this keeps the search for automorphisms from trying images that cannot work
+def order_vertices(Graph):
+    order = []
+    for root in sorted(Graph):
+        if root in order:
+            continue
+        order.append(root)
+        index = len(order)-1
+        while index < len(order):
+            for connected_vertex in sorted(Graph[order[index]]):
+                if connected_vertex not in order:
+                    order.append(connected_vertex)
+            index += 1
+
+    return order
+
+# the following function finds a single automorphism of a "Graph" that agrees with the given partial "mapping"
+# it returns the automorphism, or None if there is no such automorphism
+# the edges are tested with the adjacency bitsets of the frozen graph (see frozengraph.py)
+def find_automorphism(Graph, mapping, order=None):
+    Graph = frozengraph.freeze(Graph)
+    if order is None:
+        order = order_vertices(Graph)
+
+    mapping = dict(mapping)
+    used = set(mapping.values())
+
+    # two vertices cannot be mapped to the same vertex
+    if len(used) < len(mapping):
+        return None
+
+    # a vertex can only be mapped to an unused vertex with the same degree
+    # that keeps the edges and non-edges to every vertex mapped before it
+    def extend(index):
+        if index == len(order):
+            return True
+
+        vertex = order[index]
+        if vertex in mapping:
+            candidates = [mapping[vertex]]
+        else:
+            candidates = [image for image in order if image not in used and Graph.degree(image) == Graph.degree(vertex)]
+
+        for image in candidates:
+            consistent = True
+            for mapped_vertex in order[:index]:
+                if Graph.adjacent(mapped_vertex, vertex) != Graph.adjacent(mapping[mapped_vertex], image):
+                    consistent = False
+                    break
+            if not consistent:
+                continue
+
+            if vertex in mapping:
+                if extend(index+1):
+                    return True
+                return False
+
+            mapping[vertex] = image
+            used.add(image)
+            if extend(index+1):
+                return True
+            del mapping[vertex]
+            used.discard(image)
+
+        return False
+
+    if extend(0):
+        return mapping
+    else:
+        return None
+
+# the following function finds a set of automorphisms that generate every automorphism of a "Graph"
+# it returns the generators and the number of automorphisms of the graph (the order of the group)
+def find_generators(Graph):
+    Graph = frozengraph.freeze(Graph)
+    order = order_vertices(Graph)
+    generators = []
+    group_order = 1
+
+    # for every vertex (from the last to the first), find the vertices it can be mapped to while every earlier vertex stays fixed
+    # one automorphism is enough for every such image that the generators found so far cannot reach
+    for index in range(len(order)-1, -1, -1):
+        vertex = order[index]
+        fixed = {v: v for v in order[:index]}
+        reachable = orbit_of_vertex(vertex, generators)
+
+        for image in order:
+            if image in reachable:
+                continue
+
+            mapping = dict(fixed)
+            mapping[vertex] = image
+            automorphism = find_automorphism(Graph, mapping, order)
+            if automorphism is not None:
+                generators.append(automorphism)
+                reachable = orbit_of_vertex(vertex, generators)
+
+        group_order *= len(reachable)
+
+    return generators, group_order
+
+# the following function finds every vertex that a "vertex" can be mapped to with the given "generators"
+def orbit_of_vertex(vertex, generators):
+    reachable = [vertex]
+    for current in reachable:
+        for generator in generators:
+            if generator[current] not in reachable:
+                reachable.append(generator[current])
+
+    return set(reachable)
+
+# the following function finds the color automorphisms of Z_n, other than the identity
+# it returns them and the number of color automorphisms (the number of units of Z_n)
+def find_color_generators(n):
+    units = [u for u in range(1, n) if math.gcd(u, n) == 1]
+    generators = [{color: (color * u) % n for color in range(n)} for u in units if u != 1]
+
+    return generators, len(units)
+
+# the following function applies a "permutation" to a "Configuration", and the color automorphism "colors" (if any) to its pegs
+# the peg at vertex v moves to vertex permutation[v], the resulting configuration lists its vertices in sorted order
+def apply(permutation, Configuration, colors=None):
+    image = {}
+    for vertex in Configuration:
+        if colors is None:
+            image[permutation[vertex]] = Configuration[vertex]
+        else:
+            image[permutation[vertex]] = colors[Configuration[vertex]]
+
+    return {vertex: image[vertex] for vertex in sorted(image)}
+
+# the following function turns the "generators" and the color automorphisms "color_generators" (if any) into moves on the keys of configurations
+# (the tuples of peg values in the order of the given "vertices"), which are much faster to apply than the dictionaries (see canonical_form)
+# a move is a function that turns a key into the key of its image, made with operator.itemgetter so the peg values are gathered without a Python loop:
+# an automorphism of the graph gathers, for every index, the index of the peg it takes, and a color automorphism gathers the image of every peg value
+def compile_moves(vertices, generators, color_generators=None):
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    moves = []
+    for generator in generators:
+        taken = [0] * len(vertices)
+        for vertex in vertices:
+            taken[index[generator[vertex]]] = index[vertex]
+        moves.append(operator.itemgetter(*taken) if len(taken) > 1 else tuple)
+    for colors in color_generators or []:
+        image = operator.itemgetter(*range(len(colors)))(colors)
+        moves.append(lambda key, image=image: tuple(map(image.__getitem__, key)))
+
+    return moves
+
+# the following function finds the canonical configuration of the set of configurations symmetric to the configuration with the given "key"
+# under the compiled "moves" (see compile_moves) of the generators of the given "vertices"
+# the canonical configuration is the one with the smallest key, so every configuration of the set has the same one
+# it returns the key of the canonical configuration, the permutation and color automorphism (None without color automorphisms) that turn
+# the canonical configuration into the given one (as for apply), and the keys of every configuration of the set
+def canonical_form(key, moves, vertices, generators, color_generators=None):
+    # every key of the set, with the key and the move it was found from
+    orbit = {key: None}
+    stack = [key]
+    while len(stack) > 0:
+        current = stack.pop()
+        for m, move in enumerate(moves):
+            image = move(current)
+            if image not in orbit:
+                orbit[image] = (current, m)
+                stack.append(image)
+
+    # the moves from the given key to the canonical key, in the order they are applied
+    canonical = min(orbit)
+    path = []
+    current = canonical
+    while orbit[current] is not None:
+        current, m = orbit[current]
+        path.append(m)
+    path.reverse()
+
+    # the permutation and color automorphism of the way from the given configuration to the canonical one, turned around
+    permutation = {vertex: vertex for vertex in vertices}
+    colors = None
+    if color_generators:
+        colors = {color: color for color in color_generators[0]}
+    color_moves = len(moves) - len(color_generators or [])
+    for m in path:
+        if m < color_moves:
+            permutation = {vertex: generators[m][permutation[vertex]] for vertex in vertices}
+        else:
+            colors = {color: color_generators[m - color_moves][colors[color]] for color in colors}
+    inverse = {permutation[vertex]: vertex for vertex in vertices}
+    inverse_colors = None
+    if colors is not None:
+        inverse_colors = {colors[color]: color for color in colors}
+
+    return canonical, (inverse, inverse_colors), orbit
@@ -0,0 +1,33 @@
+# the scripts of the repository are imported as top-level modules, as they import each other
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import factory
+import game
+
+import pytest
+
+# the small graphs the engines are checked on, by family (see server.families) and arguments, with a color set
+cases = [
+    ('path', [5], 3),
+    ('star', [5], 4),
+    ('circle', [5], 5),
+    ('house', [], 3),
+]
+
+makers = {
+    'path': factory.makePathGraph,
+    'star': factory.makeStarGraph,
+    'circle': factory.makeCircleGraph,
+    'house': factory.makeHouseGraph,
+}
+
+# the following fixture gives every case as a dictionary: the graph spec of a query (see server.py), the graph, and n
+# game.n is set to n, so game.is_winnable plays with the same color set
+@pytest.fixture(params=cases, ids=lambda case: "{}{}-z{}".format(case[0], case[1], case[2]))
+def case(request, monkeypatch):
+    family, arguments, n = request.param
+    monkeypatch.setattr(game, 'n', n)
+    return {'spec': {'type': family, 'args': arguments}, 'graph': makers[family](*arguments), 'n': n}
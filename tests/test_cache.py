@@ -0,0 +1,59 @@
+# the solved-position cache (see cache.py): verdicts read back from the file, and eviction of the positions used longest ago
+
+import cache
+import factory
+import game
+import solver
+
+def test_cached_verdicts_match_game(tmp_path, case):
+    Graph = case['graph']
+    n = case['n']
+    configurations = list(factory.generateConfigurations(len(Graph), n, 1, 40))
+    expected = [game.is_winnable(Graph, configuration)[0] for configuration in configurations]
+
+    # the first solver fills the cache, the second one (a later run) reads the positions back from it
+    path = str(tmp_path / 'ps.db')
+    for run in range(2):
+        playing = solver.Solver(Graph, n, cache_path=path)
+        assert [playing.is_winnable(configuration)[0] for configuration in configurations] == expected
+        playing.cache().close()
+
+def test_evicts_the_positions_used_longest_ago(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(cache.time, 'time', lambda: next(clock))
+    solved = cache.SolvedCache(str(tmp_path / 'ps.db'), maxEntries=10)
+
+    solved.store('graph', 3, {position: (False, []) for position in range(1, 6)})
+    solved.store('graph', 3, {position: (True, [position]) for position in range(6, 11)})
+
+    # positions 1 and 2 are used again, so 3, 4, and 5 are the ones used longest ago
+    assert set(solved.lookup('graph', 3, [1, 2])) == {1, 2}
+    solved.store('graph', 3, {11: (False, []), 12: (False, [])})
+
+    found = solved.lookup('graph', 3, range(1, 13))
+    assert set(found) == {1, 2, 6, 7, 8, 9, 10, 11, 12}
+    assert found[7] == (True, [7])
+    solved.close()
+
+def test_colorsets_and_graphs_are_kept_apart(tmp_path):
+    solved = cache.SolvedCache(str(tmp_path / 'ps.db'))
+    solved.store(cache.fingerprint(factory.makePathGraph(3)), 3, {1: (True, [])})
+    assert solved.lookup(cache.fingerprint(factory.makePathGraph(3)), 4, [1]) == {}
+    assert solved.lookup(cache.fingerprint(factory.makeCircleGraph(3)), 3, [1]) == {}
+    assert solved.lookup(cache.fingerprint({3: [2], 2: [3, 1], 1: [2]}), 3, [1]) == {1: (True, [])}
+    solved.close()
+
+def test_flush_marks_the_positions_found_as_used(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(cache.time, 'time', lambda: next(clock))
+    solved = cache.SolvedCache(str(tmp_path / 'ps.db'), maxEntries=4)
+
+    solved.store('graph', 3, {1: (False, []), 2: (False, [])})
+    solved.store('graph', 3, {3: (False, []), 4: (False, [])})
+    solved.lookup('graph', 3, [1])
+    solved.flush()
+
+    # position 2 is now the one used longest ago, then 3 and 4
+    solved.store('graph', 3, {5: (False, [])})
+    assert set(solved.lookup('graph', 3, range(1, 6))) == {1, 4, 5}
+    solved.close()
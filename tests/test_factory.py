@@ -0,0 +1,27 @@
+# the numbering of the games (see factory.gameToConfiguration): the numbers and configurations map to one another,
+# and the lazy generator yields the same configurations, in the same order, as the sections of buildConfigurations
+
+import factory
+
+import pytest
+
+@pytest.mark.parametrize('size, n', [(2, 3), (4, 3), (5, 3), (4, 4), (3, 5), (6, 2)])
+def test_round_trip(size, n):
+    totalGames = ((n-1) ** (size-1)) * size
+    for gameIndex in range(1, totalGames+1):
+        configuration = factory.gameToConfiguration(gameIndex, size, n)
+        assert list(configuration) == list(range(1, size+1))
+        assert factory.configurationToGame(configuration, n) == gameIndex
+    with pytest.raises(ValueError):
+        factory.gameToConfiguration(totalGames+1, size, n)
+
+@pytest.mark.parametrize('size, n', [(2, 3), (4, 3), (5, 3), (4, 4), (3, 5), (6, 2)])
+def test_generator_matches_the_sections(size, n):
+    sections = [configuration for zero in range(1, size+1) for configuration in factory.buildConfigurations(size, n, zero)]
+    assert list(factory.generateConfigurations(size, n)) == sections
+    assert [factory.gameToConfiguration(gameIndex, size, n) for gameIndex in range(1, len(sections)+1)] == sections
+
+    # a range that starts and ends inside sections
+    first = len(sections) // 3
+    last = 2 * len(sections) // 3 + 1
+    assert list(factory.generateConfigurations(size, n, first, last)) == sections[first-1:last]
@@ -0,0 +1,42 @@
+# the frozen graph (see frozengraph.py): the problems a graph is checked for, and how configuration.py reports them
+
+import factory
+import frozengraph
+
+import os
+import runpy
+import sys
+import pytest
+
+script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'configuration.py')
+
+# a graph with every problem a graph is checked for, with the message it is reported with
+problems = [
+    ({1: [1, 2], 2: [1]}, "vertex 1 is connected to itself"),
+    ({1: [2, 3], 2: [1]}, "vertex 1 is connected to 3, which is not a vertex of the graph"),
+    ({1: [2, 2], 2: [1]}, "vertex 1 is connected to 2 more than once"),
+    ({1: [2], 2: [1, 3], 3: []}, "vertex 2 is connected to 3, but not the other way around"),
+]
+
+@pytest.mark.parametrize('Graph, message', problems)
+def test_problems(Graph, message):
+    with pytest.raises(ValueError, match=message):
+        frozengraph.freeze(Graph)
+
+def test_factory_graphs_are_frozen_as_they_are():
+    Graph = factory.makeGearGraph(4)
+    frozen = frozengraph.freeze(Graph)
+    assert frozen.copy() == Graph
+    assert all(frozen.adjacent(u, v) == (v in Graph[u]) for u in Graph for v in Graph)
+    with pytest.raises(TypeError):
+        frozen[1] = []
+
+@pytest.mark.parametrize('Graph, message', problems)
+def test_configuration_reports_problems(tmp_path, monkeypatch, capsys, Graph, message):
+    monkeypatch.setattr(factory, 'makePathGraph', lambda size, start=1: Graph)
+    monkeypatch.setattr(sys, 'argv', ['configuration.py', '-t', 'path', '-s', str(len(Graph)), '-o', 'jsonl'])
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(SystemExit):
+        runpy.run_path(script, run_name='__main__')
+    assert "configuration.py: error: the path graph is not valid: graph: {}".format(message) in capsys.readouterr().out
+    assert os.listdir(str(tmp_path)) == []
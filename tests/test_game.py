@@ -0,0 +1,83 @@
+# the search of game.is_winnable (see game.search): the same results, winning 'sequence', and 'seen' list as the list-based search it replaced,
+# and of the packed engine with the default strategy, so the order of the play-through is never changed by accident
+
+import factory
+import game
+import packed
+
+import pytest
+
+# the following function is the search of game.is_winnable before it kept a hashed set and parent pointers, as it was written
+def baseline_is_winnable(Graph, Configuration):
+    main_list = [[Configuration, 0]]
+    seen = [Configuration]
+    item = iter(main_list)
+    did_satisfy_win_condition = False
+    current_item = None
+    current_depth = 0
+    current_index = 0
+
+    while True:
+        try:
+            current_item = next(item)
+            current_depth = current_item[1]
+        except StopIteration:
+            break
+
+        if game.satisfies_win_condition(current_item[0]):
+            did_satisfy_win_condition = True
+            current_index = main_list.index(current_item)
+            break
+
+        all_moves = game.build_moves(Graph, current_item[0])
+        if len(all_moves) == 0:
+            continue
+
+        filtered_configurations = []
+        for cn in game.execute_all_moves(Graph, current_item[0], all_moves):
+            if cn not in seen:
+                seen.append(cn)
+                filtered_configurations.append(cn)
+
+        current_index = main_list.index(current_item)
+        for counter, fd_cn in enumerate(filtered_configurations):
+            main_list.insert(current_index+counter+1, [fd_cn, current_depth+1])
+
+    sequence = []
+    if did_satisfy_win_condition:
+        sequence.append(current_item[0])
+        item = reversed(main_list[0:current_index])
+        counter = 0
+        while True:
+            current_item = next(item)
+            if current_item[1] == (current_depth-counter)-1:
+                sequence.insert(0, current_item[0])
+                counter += 1
+            if current_item[1] == 0:
+                break
+
+    return did_satisfy_win_condition, sequence, seen
+
+@pytest.mark.parametrize('make, arguments', [
+    (factory.makeGeneralizedPetersenGraph, [5, 2]),
+    (factory.makeGearGraph, [4]),
+    (factory.makeCaterpillarGraph, [[1, 2, 1]]),
+    (factory.makeCompleteGraph, [5]),
+])
+@pytest.mark.parametrize('n', [3, 4])
+def test_same_play_through_as_the_baseline(monkeypatch, make, arguments, n):
+    Graph = make(*arguments)
+    monkeypatch.setattr(game, 'n', n)
+    size = len(Graph)
+    totalGames = ((n-1) ** (size-1)) * size
+
+    # a spread of games over every section
+    for gameIndex in range(1, totalGames+1, max(1, totalGames // 40)):
+        configuration = factory.gameToConfiguration(gameIndex, size, n)
+        result, sequence, seen = game.is_winnable(Graph, configuration)
+        assert (result, sequence, list(seen)) == baseline_is_winnable(Graph, configuration)
+        assert game.solve(Graph, configuration) == (result, sequence)
+
+        # the packed engine plays the same way with the default strategy
+        packedResult, packedSequence, packedSeen = packed.is_winnable(Graph, configuration)
+        assert (packedResult, packedSequence, list(packedSeen)) == (result, sequence, list(seen))
@@ -0,0 +1,57 @@
+# the results file and checkpoints (see output.py): a sweep resumed from a checkpoint cuts the results file back to it,
+# and writes every game once, in order, as a sweep that was never stopped
+
+import output
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+script = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'configuration.py')
+arguments = ['-t', 'path', '-s', '5', '-o', 'jsonl']
+resultFileName = 'ps-p(5)-z(3)-r[1-80].jsonl'
+
+def sweep(directory, *extra):
+    subprocess.run([sys.executable, script] + arguments + list(extra), cwd=str(directory), check=True, stdout=subprocess.DEVNULL)
+    return [record for record in output.readRecords(os.path.join(str(directory), resultFileName))]
+
+def test_resume_from_a_checkpoint(tmp_path):
+    records = sweep(tmp_path)
+    games = [record for record in records if 'game' in record]
+    assert [record['game'] for record in games] == list(range(1, 81))
+
+    # a sweep stopped after game 30, in the middle of writing game 45, with its last checkpoint at game 30 (and the temporary file of the next one)
+    path = str(tmp_path / resultFileName)
+    with open(path, 'w') as file:
+        file.write(json.dumps(records[0], separators=(',', ':')) + "\n")
+        for record in games[:30]:
+            file.write(json.dumps(record, separators=(',', ':')) + "\n")
+        offset = file.tell()
+        for record in games[30:44]:
+            file.write(json.dumps(record, separators=(',', ':')) + "\n")
+        file.write(json.dumps(games[44], separators=(',', ':'))[:20])
+    won = sum(1 for record in games[:30] if record['win'])
+    output.writeCheckpoint(path + '.checkpoint', {'sweep': records[0]['sweep'], 'game': 30, 'won': won, 'lost': 30 - won, 'pruned': None, 'elapsed': 1.0, 'offset': offset})
+    open(path + '.checkpoint.tmp', 'w').close()
+
+    # the partial last line is skipped when read
+    assert [record['game'] for record in output.readRecords(path) if 'game' in record] == list(range(1, 45))
+
+    resumed = sweep(tmp_path, '--resume')
+    assert resumed[0] == records[0]
+    assert [record for record in resumed if 'game' in record] == games
+    assert resumed[-1]['summary']['Won'] == records[-1]['summary']['Won']
+    assert resumed[-1]['summary']['Lost'] == records[-1]['summary']['Lost']
+    assert not os.path.exists(path + '.checkpoint')
+    assert not os.path.exists(path + '.checkpoint.tmp')
+
+def test_read_records_keeps_a_broken_line_in_the_middle(tmp_path):
+    path = str(tmp_path / 'broken.jsonl')
+    with open(path, 'w') as file:
+        file.write('{"sweep":{}}\n{"game":1,"conf\n{"game":2}\n')
+    reading = output.readRecords(path)
+    assert next(reading) == {'sweep': {}}
+    with pytest.raises(ValueError):
+        next(reading)
@@ -0,0 +1,74 @@
+# the pruning rules (see pruning.py): the verdicts do not change, the positions rejected are counted, and the wrappers return what their engine returns
+
+import factory
+import game
+import packed
+import pruning
+import retrograde
+import solver
+
+import pytest
+
+@pytest.mark.parametrize('strategy', list(packed.searches))
+def test_pruned_verdicts_match_game(case, strategy):
+    Graph = case['graph']
+    n = case['n']
+    playing = solver.Solver(Graph, n, strategy, prune=True)
+
+    for configuration in factory.generateConfigurations(len(Graph), n, 1, 40):
+        assert playing.solve(configuration)[0] == game.is_winnable(Graph, configuration)[0]
+
+def test_every_rule_rejects_a_game_that_cannot_be_won(monkeypatch):
+    monkeypatch.setattr(game, 'n', 2)
+
+    # the pegs of path(5) in Z_2 have the weighted sums 0 and 0 with the weights (1, 0, 1, 1, 0) and (0, 1, 1, 0, 1), which no single peg has
+    path = factory.makePathGraph(5)
+    pruner = pruning.build_pruner(path, 2)
+    configuration = {1: 1, 2: 1, 3: 1, 4: 0, 5: 0}
+    assert pruning.check(pruner, packed.pack(pruner['table'], configuration)) == 'invariant'
+    assert not game.is_winnable(path, configuration)[0]
+
+    # two paths that are not connected
+    paths = {1: [2], 2: [1, 3], 3: [2], 4: [5], 5: [4, 6], 6: [5]}
+    pruner = pruning.build_pruner(paths, 2)
+    configuration = {1: 0, 2: 0, 3: 1, 4: 1, 5: 1, 6: 1}
+    assert pruning.check(pruner, packed.pack(pruner['table'], configuration)) == 'components'
+    assert not game.is_winnable(paths, configuration)[0]
+
+    # the leaves of a star are never jumped over
+    star = factory.makeStarGraph(5)
+    pruner = pruning.build_pruner(star, 2)
+    configuration = {1: 1, 2: 1, 3: 1, 4: 0, 5: 0}
+    assert pruning.check(pruner, packed.pack(pruner['table'], configuration)) == 'classes'
+    assert not game.is_winnable(star, configuration)[0]
+
+def test_positions_found_back_from_the_wins_are_pruned():
+    Graph = factory.makePathGraph(5)
+    playing = solver.Solver(Graph, 4, 'bidirectional', prune=True)
+    unpruned = solver.Solver(Graph, 4, 'bidirectional')
+
+    pruned = {}
+    for configuration in factory.generateConfigurations(5, 4, 1, 100):
+        stats = {}
+        assert playing.is_winnable(configuration, stats)[0] == unpruned.is_winnable(configuration)[0]
+        for rule in stats['pruned']:
+            pruned[rule] = pruned.get(rule, 0) + stats['pruned'][rule]
+
+    assert pruned.get('invariant', 0) > 0
+
+def test_a_pruned_game_is_lost_as_its_engine_loses_it(monkeypatch):
+    monkeypatch.setattr(game, 'n', 4)
+    Graph = factory.makeStarGraph(5)
+    pruner = pruning.build_pruner(Graph, 4)
+    configuration = {1: 1, 2: 2, 3: 3, 4: 0, 5: 0}
+
+    counts = {}
+    assert pruning.solve(Graph, configuration, pruner, game.solve, counts=counts) == (False, [])
+    assert counts == {'seen': 1, 'pruned': {'classes': 1}}
+    assert pruning.solve(Graph, configuration, pruner, game.solve, sequence=False) == (False, None)
+    assert pruning.is_winnable(Graph, configuration, pruner, retrograde.is_winnable) == (False, [], [configuration])
+
+    # the packed engine counts the first position, and plays nothing
+    counts = {}
+    assert solver.Solver(Graph, 4, prune=True).solve(configuration, counts=counts) == (False, [])
+    assert counts == {'seen': 1, 'pruned': {'classes': 1}}
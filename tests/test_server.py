@@ -0,0 +1,110 @@
+# the solve server (see server.py): answers that match game.is_winnable, queries played together, and requests that are rejected
+
+import factory
+import game
+import server
+
+import http.client
+import json
+import threading
+import pytest
+
+@pytest.fixture
+def running(monkeypatch):
+    monkeypatch.setattr(server, 'workerSolvers', server.collections.OrderedDict())
+    batcher = server.Batcher(None, 0.05, 3)
+    solveServer = server.SolveServer(0, batcher, 0)
+    thread = threading.Thread(target=solveServer.serve_forever, daemon=True)
+    thread.start()
+    yield solveServer
+    solveServer.shutdown()
+    solveServer.server_close()
+
+def urlOf(solveServer):
+    return "http://127.0.0.1:{}".format(solveServer.server_address[1])
+
+# the following function sends a POST to /solve with the given "body" and headers, and returns the status and the answer
+def post(solveServer, body, headers):
+    connection = http.client.HTTPConnection('127.0.0.1', solveServer.server_address[1], timeout=10)
+    connection.putrequest('POST', '/solve')
+    for name in headers:
+        connection.putheader(name, headers[name])
+    connection.endheaders(body)
+    response = connection.getresponse()
+    answer = json.loads(response.read())
+    connection.close()
+    return response.status, answer
+
+def test_verdicts_match_game(running, case):
+    Graph = case['graph']
+    n = case['n']
+    games = list(range(1, 21))
+    expected = [game.is_winnable(Graph, factory.gameToConfiguration(gameIndex, len(Graph), n))[0] for gameIndex in games]
+
+    results = server.query(case['spec'], n, games=games, url=urlOf(running))
+    assert [result['win'] for result in results] == expected
+    for gameIndex, result in zip(games, results):
+        if result['win']:
+            assert result['sequence'][0] == list(factory.gameToConfiguration(gameIndex, len(Graph), n).values())
+
+def test_queries_at_the_same_time_get_their_own_results(running, monkeypatch):
+    Graph = factory.makePathGraph(6)
+    monkeypatch.setattr(game, 'n', 3)
+    queries = [list(range(begin, begin + 7)) for begin in range(1, 50, 7)]
+    answers = [None] * len(queries)
+
+    def ask(index):
+        answers[index] = server.query({'type': 'path', 'args': [6]}, 3, games=queries[index], sequence=False, url=urlOf(running))
+    threads = [threading.Thread(target=ask, args=(index,)) for index in range(len(queries))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for games, results in zip(queries, answers):
+        assert [result['win'] for result in results] == [game.is_winnable(Graph, factory.gameToConfiguration(gameIndex, 6, 3))[0] for gameIndex in games]
+        assert all('sequence' not in result for result in results)
+    assert running.counts == {'queries': len(queries), 'games': sum(len(games) for games in queries)}
+
+@pytest.mark.parametrize('request_body, message', [
+    ({'graph': {'type': 'path', 'args': [5]}, 'n': 1, 'games': [1]}, 'n:'),
+    ({'graph': {'type': 'nothing'}, 'games': [1]}, 'graph:'),
+    ({'graph': {'type': 'path', 'args': [3]}, 'games': [13]}, 'games:'),
+    ({'graph': {'type': 'path', 'args': [3]}, 'configurations': [[0, 0, 0]]}, 'configurations:'),
+    ({'graph': {'type': 'path', 'args': [3]}, 'configurations': [[0, 1]]}, 'configurations:'),
+    ({'graph': {'type': 'path', 'args': [3]}, 'games': 1}, 'games:'),
+    ([1, 2], 'expected a JSON object'),
+])
+def test_invalid_queries(running, request_body, message):
+    body = json.dumps(request_body).encode()
+    status, answer = post(running, body, {'Content-Length': str(len(body))})
+    assert status == 400
+    assert answer['error'].startswith(message)
+
+@pytest.mark.parametrize('length', ['abc', '-1'])
+def test_invalid_content_length(running, length):
+    status, answer = post(running, b'{}', {'Content-Length': length})
+    assert status == 400
+
+def test_request_too_large(running, monkeypatch):
+    monkeypatch.setattr(server, 'maxRequestSize', 10)
+    body = json.dumps({'graph': {'type': 'path', 'args': [3]}, 'games': [1]}).encode()
+    status, answer = post(running, body, {'Content-Length': str(len(body))})
+    assert status == 413
+
+# a pool whose worker processes died: the chunks handed to it are never played
+class DeadPool:
+    def apply_async(self, function, arguments, callback=None, error_callback=None):
+        pass
+
+def test_timeout_when_a_chunk_is_never_played():
+    solveServer = server.SolveServer(0, server.Batcher(DeadPool(), 0, 3, timeout=0.2), 1)
+    thread = threading.Thread(target=solveServer.serve_forever, daemon=True)
+    thread.start()
+    try:
+        body = json.dumps({'graph': {'type': 'path', 'args': [3]}, 'games': [1]}).encode()
+        status, answer = post(solveServer, body, {'Content-Length': str(len(body))})
+        assert status == 503
+    finally:
+        solveServer.shutdown()
+        solveServer.server_close()
@@ -0,0 +1,133 @@
+# the sharded sweeps (see shard.py): claim files, and merges of shards with missing and duplicate games
+
+import factory
+import game
+import output
+import shard
+
+import os
+import pytest
+
+size = 5
+n = 3
+totalGames = ((n-1) ** (size-1)) * size
+
+# the following function writes the results file of the given shard of the path graph, with the games [first, last]
+# the file has a summary if the shard is "finished", and the games are played by game.is_winnable
+def writeShard(path, index, count, first, last, finished=True):
+    Graph = factory.makePathGraph(size)
+    sweep = {'type': 'path', 'size': size, 'n': n, 'range': [first, last], 'graph': str(size), 'shard': {'index': index, 'count': count, 'range': [1, totalGames]}}
+    resultWriter = output.ResultWriter(str(path), sweep)
+    for gameIndex, configuration in enumerate(factory.generateConfigurations(size, n, first, last), first):
+        result, sequence, seen = game.is_winnable(Graph, configuration)
+        resultWriter.writeGame(gameIndex, configuration, result, sequence)
+    if finished:
+        summary = output.SummarySheet()
+        for column, (name, value) in enumerate([("Total", totalGames), ("Played", last-first+1), ("Time (s)", "1.000")]):
+            summary.write(0, column, name)
+            summary.write(1, column, value)
+        resultWriter.writeSummary(summary)
+    resultWriter.close()
+    return str(path)
+
+# the following function checks that the merged file has every game in order once, with the verdict of game.is_winnable
+def checkMerged(path, games):
+    Graph = factory.makePathGraph(size)
+    records = [record for record in output.readRecords(path) if 'game' in record]
+    assert [record['game'] for record in records] == games
+    for record in records:
+        configuration = factory.gameToConfiguration(record['game'], size, n)
+        assert record['configuration'] == list(configuration.values())
+        assert record['win'] == game.is_winnable(Graph, configuration)[0]
+
+@pytest.fixture(autouse=True)
+def colorset(monkeypatch):
+    monkeypatch.setattr(game, 'n', n)
+
+def test_shards_cover_the_sweep():
+    ranges = [shard.shardRange(1, totalGames, index, 3) for index in range(1, 4)]
+    assert ranges[0][0] == 1 and ranges[-1][1] == totalGames
+    assert all(ranges[i][1] + 1 == ranges[i+1][0] for i in range(2))
+
+def test_merge_reports_a_gap(tmp_path):
+    paths = [writeShard(tmp_path / 'a.jsonl', 1, 3, 1, 26), writeShard(tmp_path / 'c.jsonl', 3, 3, 54, 80)]
+    report = shard.mergeShards(paths, str(tmp_path / 'merged.jsonl'))
+    assert next(output.readRecords(str(tmp_path / 'merged.jsonl')))['sweep'] == {'type': 'path', 'size': size, 'n': n, 'graph': str(size), 'range': [1, totalGames]}
+    assert report['missing'] == [[27, 53]]
+    assert report['duplicates'] == []
+    assert report['summary']['Played'] == 53
+    checkMerged(str(tmp_path / 'merged.jsonl'), list(range(1, 27)) + list(range(54, 81)))
+
+def test_merge_writes_a_duplicate_once(tmp_path):
+    paths = [writeShard(tmp_path / 'a.jsonl', 1, 2, 1, 45), writeShard(tmp_path / 'b.jsonl', 2, 2, 41, 80)]
+    report = shard.mergeShards(paths, str(tmp_path / 'merged.jsonl'))
+    assert report['missing'] == []
+    assert report['duplicates'] == [[41, 45]]
+    assert report['summary']['Played'] == totalGames
+    checkMerged(str(tmp_path / 'merged.jsonl'), list(range(1, totalGames+1)))
+
+def test_merge_skips_a_partial_last_line(tmp_path):
+    path = writeShard(tmp_path / 'a.jsonl', 1, 2, 1, 40, finished=False)
+    with open(path, 'a') as file:
+        file.write('{"game":41,"configuration":[0,1')
+    report = shard.mergeShards([path], str(tmp_path / 'merged.jsonl'))
+    assert report['missing'] == [[41, totalGames]]
+    assert report['unfinished'] == [path]
+    checkMerged(str(tmp_path / 'merged.jsonl'), list(range(1, 41)))
+
+def test_merge_rejects_shards_of_another_graph(tmp_path):
+    first = writeShard(tmp_path / 'a.jsonl', 1, 2, 1, 40)
+    second = str(tmp_path / 'b.jsonl')
+    output.ResultWriter(second, {'type': 'path', 'size': size, 'n': n, 'range': [41, 80], 'graph': '6', 'shard': {'index': 2, 'count': 2, 'range': [1, totalGames]}}).close()
+    with pytest.raises(ValueError):
+        shard.mergeShards([first, second], str(tmp_path / 'merged.jsonl'))
+
+def test_merge_rejects_shards_of_another_sweep(tmp_path):
+    first = writeShard(tmp_path / 'a.jsonl', 1, 2, 1, 40)
+    second = str(tmp_path / 'b.jsonl')
+    output.ResultWriter(second, {'type': 'path', 'size': size, 'n': n+1, 'range': [41, 80], 'graph': str(size), 'shard': {'index': 2, 'count': 2, 'range': [1, totalGames]}}).close()
+    with pytest.raises(ValueError):
+        shard.mergeShards([first, second], str(tmp_path / 'merged.jsonl'))
+
+def test_claims(tmp_path):
+    directory = str(tmp_path)
+    assert shard.claimShard(directory, 1, 300) == 'new'
+    assert shard.claimShard(directory, 1, 300) is None
+    assert shard.claimShard(directory, 2, 300) == 'new'
+
+    # a claim that was not touched for longer than the stale time is taken over
+    os.utime(os.path.join(directory, '1.claim'), (0, 0))
+    assert shard.claimShard(directory, 1, 300) == 'stale'
+    assert shard.claimShard(directory, 1, 300) is None
+
+def test_stale_claim_is_taken_over_once(tmp_path, monkeypatch):
+    directory = str(tmp_path)
+    claimPath = os.path.join(directory, '1.claim')
+    assert shard.claimShard(directory, 1, 300) == 'new'
+
+    # another worker read the claim as stale, but it was taken over (and is fresh) by the time this worker holds the lock
+    getmtime = os.path.getmtime
+    reads = []
+    def staleOnce(path):
+        reads.append(path)
+        return 0 if len(reads) == 1 else getmtime(path)
+    monkeypatch.setattr(shard.os.path, 'getmtime', staleOnce)
+    assert shard.claimShard(directory, 1, 300) is None
+    assert os.path.exists(claimPath)
+    assert not os.path.exists(os.path.join(directory, '1.lock'))
+
+def test_stale_claim_waits_for_the_lock(tmp_path):
+    directory = str(tmp_path)
+    assert shard.claimShard(directory, 1, 300) == 'new'
+    os.utime(os.path.join(directory, '1.claim'), (0, 0))
+
+    # another worker is taking over the claim
+    lockPath = os.path.join(directory, '1.lock')
+    open(lockPath, 'w').close()
+    assert shard.claimShard(directory, 1, 300) is None
+
+    # the lock of a worker that stopped while taking over is removed, and the claim is taken over next time
+    os.utime(lockPath, (0, 0))
+    assert shard.claimShard(directory, 1, 300) is None
+    assert not os.path.exists(lockPath)
+    assert shard.claimShard(directory, 1, 300) == 'stale'
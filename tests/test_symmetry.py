@@ -0,0 +1,46 @@
+# the symmetry reduction (see symmetry.py): every configuration has the verdict of its canonical configuration,
+# and the winning 'sequence' of the canonical configuration is carried over to it, as sweep.py does
+
+import factory
+import game
+import symmetry
+
+import pytest
+
+def is_sequence_of(Graph, sequence, configuration):
+    if sequence[0] != configuration or not game.satisfies_win_condition(sequence[-1]):
+        return False
+    return all(any(game.execute_move(Graph, before, move) == after for move in game.build_moves(Graph, before)) for before, after in zip(sequence, sequence[1:]))
+
+@pytest.mark.parametrize('colors', [False, True])
+def test_canonical_verdicts_match_game(case, colors):
+    Graph = case['graph']
+    n = case['n']
+    vertices = sorted(Graph)
+    generators, automorphismCount = symmetry.find_generators(Graph)
+    colorGenerators, colorAutomorphismCount = symmetry.find_color_generators(n) if colors else ([], 1)
+    moves = symmetry.compile_moves(vertices, generators, colorGenerators)
+
+    solved = {}
+    for configuration in factory.generateConfigurations(len(Graph), n):
+        result, sequence, seen = game.is_winnable(Graph, configuration)
+        key, (permutation, colorAutomorphism), orbit = symmetry.canonical_form(tuple(configuration.values()), moves, vertices, generators, colorGenerators)
+        assert key == min(orbit)
+        assert len(orbit) <= automorphismCount * colorAutomorphismCount
+
+        # the canonical configuration is turned into this one by the permutation and color automorphism
+        canonical = dict(zip(vertices, key))
+        assert symmetry.apply(permutation, canonical, colorAutomorphism) == configuration
+
+        if key not in solved:
+            solved[key] = game.is_winnable(Graph, canonical)[:2]
+        canonicalResult, canonicalSequence = solved[key]
+        assert canonicalResult == result
+        if result:
+            assert is_sequence_of(Graph, [symmetry.apply(permutation, c, colorAutomorphism) for c in canonicalSequence], configuration)
+
+def test_color_generators_are_the_units():
+    generators, count = symmetry.find_color_generators(6)
+    assert count == 2
+    assert generators == [{0: 0, 1: 5, 2: 4, 3: 3, 4: 2, 5: 1}]
+    assert symmetry.find_color_generators(2) == ([], 1)
@@ -0,0 +1,89 @@
+# name: transposition
+# description: Python Script that keeps the results of positions in memory across the games of a batch, with the least recently used positions removed first
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# the table has the same lookup and store functions as the cache file of cache.py, so the packed engine uses it the same way (see packed.find_path)
+# but it is kept in memory only, for the games played by a single process, and holds at most a given number of positions
+# positions are packed as in packed.py, and every position keeps a single integer:
+#   -1: the position cannot be won
+#   0: the position is a win (a single peg)
+#   any other value: the position can be won, and the value is the position that follows it on the way to a win
+# the winning line of a position is found by following the positions that follow it, up to a win
+# a line broken by a position that was removed from the table is not used
+
+import collections
+
+# the following class is the table of solved positions of a single graph and color set, with at most "maxEntries" positions
+# a lookup or store for another graph or color set empties the table first
+class TranspositionTable:
+    def __init__(self, maxEntries=1000000):
+        self.maxEntries = maxEntries
+        self.positions = collections.OrderedDict()
+        self.key = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.positions)
+
+    # the following function empties the table if the given "graphFingerprint" and n are not the ones of the positions it holds
+    def use(self, graphFingerprint, n):
+        if self.key != (graphFingerprint, n):
+            self.positions.clear()
+            self.key = (graphFingerprint, n)
+
+    # the following function looks up the given "positions" of the graph with the given "graphFingerprint" and n colors
+    # it returns a dictionary that maps every position found to its result and winning line (empty if not winnable), as cache.SolvedCache.lookup
+    def lookup(self, graphFingerprint, n, positions):
+        self.use(graphFingerprint, n)
+        table = self.positions
+        found = {}
+
+        for position in positions:
+            value = table.get(position)
+            if value is None:
+                self.misses += 1
+                continue
+
+            # the position was used, so it is removed last
+            table.move_to_end(position)
+            if value == -1:
+                found[position] = (False, [])
+                self.hits += 1
+                continue
+
+            line = []
+            while value is not None and value > 0:
+                line.append(value)
+                value = table.get(value)
+            if value == 0:
+                found[position] = (True, line)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return found
+
+    # the following function does nothing, as a lookup already marks the positions found as used (see cache.SolvedCache.flush)
+    def flush(self):
+        pass
+
+    # the following function stores the result and winning line of every position in the dictionary "solved", as cache.SolvedCache.store
+    # the positions used longest ago are removed, to keep at most "maxEntries" positions
+    def store(self, graphFingerprint, n, solved):
+        self.use(graphFingerprint, n)
+        table = self.positions
+
+        for position in solved:
+            winnable, line = solved[position]
+            if not winnable:
+                table[position] = -1
+            elif len(line) > 0:
+                table[position] = line[0]
+            else:
+                table[position] = 0
+            table.move_to_end(position)
+
+        while len(table) > self.maxEntries:
+            table.popitem(last=False)
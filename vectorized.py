@@ -0,0 +1,140 @@
+# name: vectorized
+# description: The peg solitaire implementation that plays a whole level of positions at once, with NumPy arrays
+# author: Gustavo Sopena
+# date started: Sunday: October 18, 2026
+
+# a level of the breadth first search is a 'frontier': an array with one row per position and one column per vertex (in sorted order)
+# every move of every position of the frontier is played at once, and the positions found are packed as in packed.py
+# to remove the positions found twice, or seen in an earlier level
+# NumPy is only needed when this engine is used
+
+import game
+import packed
+import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# at most this many positions of a frontier are played at once, to bound the memory used by a level
+batch_size = 1 << 16
+
+# the following function builds the arrays used to play a whole frontier on a given "Graph" with n colors
+# it adds to the table of packed.py the columns of the (from, over, to) vertices of every jump, and the weight of every column in a packed position
+def build_table(Graph, n):
+    table = packed.build_table(Graph, n)
+    jumps = numpy.array(table['jumps'], dtype=numpy.int64).reshape(-1, 3) // table['bits']
+
+    table['from'] = jumps[:, 0]
+    table['over'] = jumps[:, 1]
+    table['to'] = jumps[:, 2]
+    table['shifts'] = numpy.arange(len(table['vertices']), dtype=numpy.int64) * table['bits']
+
+    return table
+
+# the following function checks whether the positions of a given "Graph" with n colors fit into the 63 bits of a NumPy integer
+def fits(Graph, n):
+    return len(Graph) * max(1, (n-1).bit_length()) <= 63
+
+# the following function plays every move of every one of the packed "positions"
+# it returns the positions found (packed, sorted, and without repeats), the index of the position each of them came from, and whether each of them is a win
+def expand(table, positions):
+    n = table['n']
+    found = []
+    rows = []
+    wins = []
+
+    for begin in range(0, len(positions), batch_size):
+        frontier = ((positions[begin:begin+batch_size, None] >> table['shifts']) & table['mask']).astype(numpy.uint8)
+
+        # a jump can be played when the first and second vertex have a peg, and the third vertex does not
+        playable = (frontier[:, table['from']] != 0) & (frontier[:, table['over']] != 0) & (frontier[:, table['to']] == 0)
+        row, jump = numpy.nonzero(playable)
+        first = table['from'][jump]
+        second = table['over'][jump]
+        third = table['to'][jump]
+        index = numpy.arange(len(row))
+
+        # remove the pegs from the first and second vertex
+        # place the jumping peg into the third vertex, and the sum of the two peg values (mod n) into the second vertex
+        child = frontier[row]
+        peg = child[index, first]
+        child[index, second] = (peg.astype(numpy.int64) + child[index, second]) % n
+        child[index, first] = 0
+        child[index, third] = peg
+
+        # pack the positions found, and keep the first time every one of them is found
+        child_positions, unique = numpy.unique((child.astype(numpy.int64) << table['shifts']).sum(axis=1), return_index=True)
+        found.append(child_positions)
+        rows.append(row[unique] + begin)
+        wins.append(numpy.count_nonzero(child[unique], axis=1) == 1)
+
+    if len(found) == 0:
+        return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=bool)
+
+    found, unique = numpy.unique(numpy.concatenate(found), return_index=True)
+    return found, numpy.concatenate(rows)[unique], numpy.concatenate(wins)[unique]
+
+# the following function turns an array of packed "positions" into a list of Python integers, kept as compactly as the array
+def as_list(positions):
+    compact = array.array('q')
+    compact.frombytes(positions.astype(numpy.int64).tobytes())
+    return compact
+
+# the following function searches for a win from the given "start" position, one level of positions at a time
+# it returns the shortest winning path (empty if there is none), and every position seen, as the searches of packed.py do
+def search(table, start):
+    peg_count = packed.count_pegs(table, start)
+    if peg_count == 0:
+        raise Exception("All vertices contain a zero peg value.")
+    if peg_count == 1:
+        return [start], [start]
+
+    # every level keeps its positions (sorted) and the position of the level above that each of them came from
+    levels = [(numpy.array([start], dtype=numpy.int64), None)]
+    seen = numpy.array([start], dtype=numpy.int64)
+
+    while len(levels[-1][0]) > 0:
+        level = levels[-1][0]
+        positions, rows, wins = expand(table, level)
+
+        # keep the positions that were not seen in an earlier level
+        new = ~numpy.isin(positions, seen, assume_unique=True)
+        positions = positions[new]
+        parents = level[rows[new]]
+        wins = wins[new]
+
+        seen = numpy.concatenate([seen, positions])
+        levels.append((positions, parents))
+
+        if wins.any():
+            # follow the parents of the winning position back to the start
+            position = positions[numpy.argmax(wins)]
+            path = [int(position)]
+            for positions, parents in reversed(levels[1:]):
+                position = parents[numpy.searchsorted(positions, position)]
+                path.append(int(position))
+            path.reverse()
+            return path, as_list(seen)
+
+    return [], as_list(seen)
+
+# the following function determines whether a "Graph" with "Configuration" has a winning 'sequence' of moves
+# it returns the same result as game.is_winnable, where the 'sequence' has the least number of moves
+# the "table" can be given (see build_table) to avoid building it again for every game on the same graph
+# positions that do not fit into a NumPy integer (see fits) are played by packed.py, with the same breadth first order
+def is_winnable(Graph, Configuration, table=None):
+    if table is None:
+        table = build_table(Graph, game.n)
+
+    if not fits(Graph, table['n']):
+        return packed.is_winnable(Graph, Configuration, table, strategy='bfs')
+
+    path, seen_positions = search(table, packed.pack(table, Configuration))
+    seen = packed.UnpackedPositions(table, seen_positions)
+
+    if len(path) > 0:
+        return True, [packed.unpack(table, position) for position in path], seen
+    else:
+        return False, [], seen